@@ -111,7 +111,9 @@ def select_audio_channel(
         if spectrogram_parameters.channel < available_channels
         else 0
     )
-    return wav[dict(channel=[channel_to_use])]
+    # A length-one slice keeps the channel dimension and, unlike a list
+    # indexer, returns a view instead of copying the samples.
+    return wav.isel({channel_dim: slice(channel_to_use, channel_to_use + 1)})
 
 
 BIT_DEPTH_MAP: dict[str, int] = {
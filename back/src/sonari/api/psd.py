@@ -3,12 +3,12 @@
 from pathlib import Path
 
 import numpy as np
-from soundevent import arrays, audio
 from soundevent.arrays import Dimensions, get_dim_step
 
 import sonari.api.audio as audio_api
 from sonari import schemas
-from sonari.core.spectrograms import compute_spectrogram_from_samples
+from sonari.core.psd import frequency_axis
+from sonari.core.spectrograms import compute_spectrogram_from_samples, pcen_array, to_db
 
 __all__ = [
     "compute_psd",
@@ -163,28 +163,25 @@ def compute_psd(
 
     # De-noise spectrogram with PCEN if enabled
     if spectrogram_parameters.pcen:
-        spectrogram = audio.pcen(spectrogram)
+        spectrogram = spectrogram.copy(
+            data=pcen_array(spectrogram.data, axis=spectrogram.get_axis_num(Dimensions.time.value))
+        )
 
     # Convert to dB scale
-    spectrogram = arrays.to_db(
+    spectrogram = to_db(
         spectrogram,
         min_db=spectrogram_parameters.min_dB,
         max_db=spectrogram_parameters.max_dB,
     )
 
-    # Get the spectrogram array and squeeze unnecessary dimensions
-    spec_array = spectrogram.data.squeeze()
-
-    # spec_array is (frequency, time) - average over time axis (axis=1)
-    if spec_array.ndim == 2:
-        psd = np.mean(spec_array, axis=1)
-    else:
-        psd = spec_array
+    # The spectrogram is laid out as (frequency, time, channel) and holds a
+    # single channel after channel selection, so average over the time axis
+    # of that channel directly.
+    spec_array = np.asarray(spectrogram.data)
+    psd = spec_array[:, :, 0].mean(axis=1)
 
-    # Compute frequency array
-    num_freq_bins = len(psd)
-    nyquist = samplerate / 2
-    frequencies = np.linspace(0, nyquist, num_freq_bins)
+    # Frequency array only depends on the samplerate and number of bins
+    frequencies = frequency_axis(samplerate, len(psd))
 
     return psd, frequencies, samplerate
 
@@ -2,50 +2,71 @@
 
 from pathlib import Path
 
+import cachetools
 import numpy as np
-from soundevent import arrays, audio
+import xarray as xr
 from soundevent.arrays import Dimensions, get_dim_step
 
 import sonari.api.audio as audio_api
 from sonari import schemas
-from sonari.core.spectrograms import compute_spectrogram_from_samples, normalize_spectrogram
+from sonari.core.spectrograms import compute_spectrogram_from_samples, normalize_array, pcen_array, to_db_array
 
 __all__ = [
     "compute_spectrogram",
     "compute_waveform",
 ]
 
-
-def compute_spectrogram(
+# Linear STFT power of recently requested segments, bounded by total size in
+# bytes. Changing display settings such as the dB range, normalization, PCEN
+# or colormap re-requests the same segments, which can then skip loading the
+# audio and the STFT.
+_STFT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_stft_cache: cachetools.LRUCache = cachetools.LRUCache(
+    maxsize=_STFT_CACHE_MAX_BYTES,
+    getsizeof=lambda spectrogram: spectrogram.nbytes,
+)
+
+# Final spectrogram arrays of recently requested segments. Viewers request
+# the same segments again when scrolling back, which then skips all work.
+_SPECTROGRAM_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_spectrogram_cache: cachetools.LRUCache = cachetools.LRUCache(
+    maxsize=_SPECTROGRAM_CACHE_MAX_BYTES,
+    getsizeof=lambda array: array.nbytes,
+)
+
+# Spectrogram parameters that only affect how the array is rendered.
+_DISPLAY_ONLY_PARAMETERS = {"cmap", "gamma", "time_zoom_automatic", "time_zoom_duration_seconds"}
+
+
+def _compute_power_spectrogram(
     recording: schemas.Recording,
     start_time: float,
     end_time: float,
     audio_parameters: schemas.AudioParameters,
     spectrogram_parameters: schemas.SpectrogramParameters,
-    audio_dir: Path | None = None,
-) -> np.ndarray:
-    """Compute a spectrogram for a recording.
-
-    Parameters
-    ----------
-    recording
-        The recording to compute the spectrogram for.
-    start_time
-        Start time in seconds.
-    end_time
-        End time in seconds.
-    audio_dir
-        The directory where the audio files are stored.
-    spectrogram_parameters : SpectrogramParameters
-        Spectrogram parameters.
+    audio_dir: Path,
+) -> xr.DataArray:
+    """Compute the linear STFT power of a recording segment.
 
-    Returns
-    -------
-    DataArray
-        Spectrogram image.
+    Results are cached on everything that affects the STFT, so requests
+    that only differ in how the spectrogram is scaled or rendered reuse it.
+    The returned spectrogram is shared and must not be modified in place.
     """
-    if audio_dir is None:
-        audio_dir = Path.cwd()
+    key = (
+        recording.hash,
+        str(audio_dir),
+        start_time,
+        end_time,
+        tuple(audio_parameters.model_dump().values()),
+        spectrogram_parameters.window_size_samples,
+        spectrogram_parameters.overlap_percent,
+        spectrogram_parameters.window,
+        spectrogram_parameters.channel,
+        spectrogram_parameters.mix_channels,
+    )
+    spectrogram = _stft_cache.get(key)
+    if spectrogram is not None:
+        return spectrogram
 
     wav = audio_api.load_audio(
         recording,
@@ -94,33 +115,98 @@ def compute_spectrogram(
         hop_size_samples,
         window_type=spectrogram_parameters.window,
     )
+    spectrogram.data.setflags(write=False)
+    _stft_cache[key] = spectrogram
+    return spectrogram
+
+
+def compute_spectrogram(
+    recording: schemas.Recording,
+    start_time: float,
+    end_time: float,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    audio_dir: Path | None = None,
+) -> np.ndarray:
+    """Compute a spectrogram for a recording.
+
+    Parameters
+    ----------
+    recording
+        The recording to compute the spectrogram for.
+    start_time
+        Start time in seconds.
+    end_time
+        End time in seconds.
+    audio_dir
+        The directory where the audio files are stored.
+    spectrogram_parameters : SpectrogramParameters
+        Spectrogram parameters.
+
+    Returns
+    -------
+    np.ndarray
+        Spectrogram image. The array may be shared with later calls and is
+        read-only.
+    """
+    if audio_dir is None:
+        audio_dir = Path.cwd()
+
+    key = (
+        recording.hash,
+        str(audio_dir),
+        start_time,
+        end_time,
+        audio_parameters,
+        tuple(spectrogram_parameters.model_dump(exclude=_DISPLAY_ONLY_PARAMETERS).values()),
+    )
+    cached = _spectrogram_cache.get(key)
+    if cached is not None:
+        return cached
+
+    spectrogram = _compute_power_spectrogram(
+        recording,
+        start_time,
+        end_time,
+        audio_parameters,
+        spectrogram_parameters,
+        audio_dir,
+    )
+
+    # From here on only the values are needed, so work on the raw array
+    # instead of going through xarray for every step.
+    attrs = spectrogram.attrs
+    array = spectrogram.data
 
     # De-noise spectrogram with PCEN
     if not spectrogram_parameters.pcen:
         # NOTE: PCEN expects a spectrogram in amplitude scale so it should be
         # applied before scaling.
-        spectrogram = audio.pcen(spectrogram)
+        array = pcen_array(array, axis=spectrogram.get_axis_num(Dimensions.time.value))
 
-    # Scale spectrogram.
-    spectrogram = arrays.to_db(
-        spectrogram,
+    # Scale spectrogram. This writes into a new array, leaving the cached
+    # STFT untouched, so the remaining steps can run in place.
+    array = to_db_array(
+        array,
         min_db=spectrogram_parameters.min_dB,
         max_db=spectrogram_parameters.max_dB,
     )
 
     # Scale to [0, 1]. If normalization is relative, the minimum and maximum
     # values are computed from the spectrogram, otherwise they are taken from
-    # the provided min_dB and max_dB.
-    spectrogram = normalize_spectrogram(
-        spectrogram,
-        relative=spectrogram_parameters.normalize,
+    # the spectrogram attributes when available.
+    relative = spectrogram_parameters.normalize
+    array = normalize_array(
+        array,
+        min_val=None if relative else attrs.get("min_dB"),
+        max_val=None if relative else attrs.get("max_dB"),
     )
 
-    # Get the underlying numpy array.
-    array = spectrogram.data
-
     # Remove unncecessary dimensions.
-    return array.squeeze()
+    array = array.squeeze()
+    array.setflags(write=False)
+    _spectrogram_cache[key] = array
+    return array
 
 
 def compute_waveform(
@@ -202,11 +288,11 @@ def compute_waveform(
     samples_per_pixel = len(waveform) // width
 
     if samples_per_pixel > 1:
-        # Reshape and compute min/max for each pixel column
-        truncated_length = (len(waveform) // samples_per_pixel) * samples_per_pixel
-        reshaped = waveform[:truncated_length].reshape(-1, samples_per_pixel)
-        waveform_max = reshaped.max(axis=1)
-        waveform_min = reshaped.min(axis=1)
+        # Compute min/max over non-overlapping windows, one per pixel column.
+        # The strided view covers every complete window without copying.
+        windows = np.lib.stride_tricks.sliding_window_view(waveform, samples_per_pixel)[::samples_per_pixel]
+        waveform_max = windows.max(axis=-1)
+        waveform_min = windows.min(axis=-1)
     else:
         # If we have fewer samples than pixels, just use the waveform as-is
         # and pad or interpolate if needed
@@ -229,17 +315,14 @@ def compute_waveform(
         scale = 1
 
     # For each x position, fill from min to max amplitude
-    for x in range(min(width, len(waveform_max))):
-        y_max = int(center - waveform_max[x] * scale)
-        y_min = int(center - waveform_min[x] * scale)
-
-        # Clamp to valid range
-        y_max = max(0, min(height - 1, y_max))
-        y_min = max(0, min(height - 1, y_min))
-
-        # Fill from min to max (or max to min if inverted)
-        start_y = min(y_max, y_min)
-        end_y = max(y_max, y_min) + 1
-        canvas[start_y:end_y, x] = 1.0
+    columns = min(width, len(waveform_max))
+    y_max = np.clip((center - waveform_max[:columns] * scale).astype(np.int32), 0, height - 1)
+    y_min = np.clip((center - waveform_min[:columns] * scale).astype(np.int32), 0, height - 1)
+
+    # Fill from min to max (or max to min if inverted)
+    start_y = np.minimum(y_max, y_min)
+    end_y = np.maximum(y_max, y_min)
+    rows = np.arange(height)[:, None]
+    canvas[:, :columns] = (rows >= start_y) & (rows <= end_y)
 
     return canvas
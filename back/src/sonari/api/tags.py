@@ -1,16 +1,20 @@
 """API functions to interact with tags."""
 
+from operator import itemgetter
 from typing import Any, Sequence
 
-from sqlalchemy import and_, tuple_
+from sqlalchemy import and_, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sonari import exceptions, models, schemas
 from sonari.api.common import BaseAPI
+from sonari.models.tag import TAG_KEY_SEPARATOR
 from sonari.schemas.users import SimpleUser
 
 __all__ = [
     "TagAPI",
+    "find_tag",
+    "find_tag_value",
     "tags",
 ]
 
@@ -26,6 +30,7 @@ class TagAPI(
 ):
     _model = models.Tag
     _schema = schemas.Tag
+    _key_getter = staticmethod(itemgetter("key", "value"))
 
     async def create(
         self,
@@ -94,13 +99,12 @@ class TagAPI(
         return and_(self._model.key == pk[0], self._model.value == pk[1])
 
     def _key_fn(self, obj: dict):
-        return (obj.get("key"), obj.get("value"))
+        # Combined "key<US>value" string matching `_get_key_column`, so bulk
+        # lookups compare a single indexed expression instead of row values.
+        return TAG_KEY_SEPARATOR.join(self._key_getter(obj))
 
     def _get_key_column(self):
-        return tuple_(
-            self._model.key,
-            self._model.value,
-        )
+        return self._model.key + literal_column(f"'{TAG_KEY_SEPARATOR}'") + self._model.value
 
 
 def find_tag(
@@ -1,5 +1,6 @@
 """Functions to handle images."""
 
+from functools import lru_cache
 from io import BytesIO
 
 import numpy as np
@@ -14,6 +15,44 @@ __all__ = [
 
 max_webp_size: int = (2**14) - 1
 
+# Number of input levels per colormap entry in the combined gamma and
+# colormap table. Levels are an integer multiple of the colormap size, so
+# a gamma of 1 maps every value to exactly the entry matplotlib would use.
+_levels_per_color: int = 16
+
+
+@lru_cache(maxsize=32)
+def _get_colormap_lut(cmap: str) -> np.ndarray:
+    """Return the colors of a matplotlib colormap packed as uint32 RGBA.
+
+    Integer input indexes the colormap directly, so this yields one color per
+    colormap entry. Packing the four uint8 channels into a single uint32
+    turns the lookup into a scalar gather. The table is read-only as it is
+    shared between calls.
+    """
+    colormap = colormaps.get_cmap(cmap)
+    lut = colormap(np.arange(colormap.N), bytes=True).view(np.uint32).ravel()
+    lut.setflags(write=False)
+    return lut
+
+
+@lru_cache(maxsize=64)
+def _get_gamma_colormap_lut(cmap: str, gamma: float) -> np.ndarray:
+    """Return a colormap table that also applies gamma correction.
+
+    Entry ``i`` holds the color of the value ``((i + 0.5) / levels) ** (1 /
+    gamma)``, so quantizing the input to the table size and taking one
+    lookup replaces evaluating the power for every pixel. The table is
+    read-only as it is shared between calls.
+    """
+    colors = _get_colormap_lut(cmap)
+    levels = len(colors) * _levels_per_color
+    values = np.power((np.arange(levels) + 0.5) / levels, 1 / gamma)
+    indices = np.clip((values * len(colors)).astype(np.intp), 0, len(colors) - 1)
+    lut = colors.take(indices)
+    lut.setflags(write=False)
+    return lut
+
 
 def array_to_image(array: np.ndarray, cmap: str, gamma: float) -> Image:
     """Convert a numpy array to a PIL image.
@@ -39,19 +78,15 @@ def array_to_image(array: np.ndarray, cmap: str, gamma: float) -> Image:
     if array.ndim != 2:
         raise ValueError("The array must be 2D.")
 
-    # Cache the colormap outside the function if you're using the same one repeatedly
-    colormap = colormaps.get_cmap(cmap)
-
-    # Combine operations to reduce memory allocations
-    # Use in-place operations where possible
-    array = np.flipud(array)
-
-    # Avoid PowerNorm class - implement gamma correction directly
-    # This is much faster than using matplotlib's PowerNorm
-    normalized_array = np.power(array, 1 / gamma, out=array)  # in-place operation
+    # Gamma correction and the colormap are folded into a single cached
+    # table, so each pixel is quantized once and looked up once
+    lut = _get_gamma_colormap_lut(cmap, float(gamma))
 
-    # Apply colormap and convert to uint8 in one step
-    color_array = colormap(normalized_array, bytes=True)
+    # Map values to table entries the same way matplotlib maps them to
+    # colormap entries, with 1.0 falling into the last entry
+    indices = np.multiply(np.flipud(array), len(lut)).astype(np.intp)
+    np.clip(indices, 0, len(lut) - 1, out=indices)
+    color_array = lut.take(indices).view(np.uint8).reshape(*indices.shape, 4)
 
     return img.fromarray(color_array)
 
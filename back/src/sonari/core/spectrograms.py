@@ -1,10 +1,11 @@
 """Functions for spectrogram manipulation."""
 
+from functools import lru_cache
 from typing import Callable, Literal, Optional, Union
 
 import numpy as np
 import xarray as xr
-from scipy import signal
+from scipy import fft, signal
 from soundevent.arrays import (
     ArrayAttrs,
     Dimensions,
@@ -14,12 +15,242 @@ from soundevent.arrays import (
 )
 
 __all__ = [
+    "normalize_array",
     "normalize_spectrogram",
+    "pcen_array",
+    "to_db",
+    "to_db_array",
     "compute_spectrogram_from_samples",
+    "set_fft_backend",
 ]
 
 DEFAULT_DIM_ORDER = ("frequency", "time", "channel")
 
+# Frame batches with at least this many samples are transformed with one
+# FFT thread per CPU. Below it, starting the threads costs more than the
+# transform itself.
+PARALLEL_FFT_MIN_SAMPLES = 2**21
+
+# Size of the windowed frames transformed at once by the STFT. Long signals
+# are processed in blocks of this size to bound the intermediate memory.
+STFT_BLOCK_BYTES = 8 * 1024 * 1024
+
+
+def set_fft_backend(backend: Literal["pocketfft", "fftw"]) -> bool:
+    """Select the FFT implementation used to compute spectrograms.
+
+    Spectrograms are computed with ``scipy.fft``, which dispatches to its
+    global backend. ``fftw`` registers pyFFTW's scipy interface as that
+    backend, with FFTW plans cached between calls. This affects the whole
+    process.
+
+    Parameters
+    ----------
+    backend : Literal["pocketfft", "fftw"]
+        The FFT implementation to use.
+
+    Returns
+    -------
+    bool
+        False if ``fftw`` was requested but pyFFTW is not installed, in which
+        case scipy's own FFT stays in use.
+    """
+    if backend == "pocketfft":
+        fft.set_global_backend("scipy")
+        return True
+
+    try:
+        import pyfftw
+        import pyfftw.interfaces.scipy_fft
+    except ImportError:
+        return False
+
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    fft.set_global_backend(pyfftw.interfaces.scipy_fft)
+    return True
+
+
+def to_db(
+    spectrogram: xr.DataArray,
+    min_db: float | None = -80.0,
+    max_db: float | None = None,
+    amin: float = 1e-10,
+) -> xr.DataArray:
+    """Convert a power spectrogram to decibels.
+
+    Equivalent to ``soundevent.arrays.to_db`` with a reference of 1, but the
+    result keeps the dtype of the input instead of being promoted to
+    float64.
+
+    Parameters
+    ----------
+    spectrogram : xr.DataArray
+        The power spectrogram to convert.
+    min_db : float | None
+        Values below this threshold are clamped to it. If None, no minimum
+        is applied.
+    max_db : float | None
+        Values above this threshold are clamped to it. If None, no maximum
+        is applied.
+    amin : float
+        Values below this threshold are raised to it before taking the
+        logarithm.
+
+    Returns
+    -------
+    xr.DataArray
+        The spectrogram in decibels.
+
+    """
+    data = to_db_array(spectrogram.data, min_db=min_db, max_db=max_db, amin=amin)
+
+    attrs = spectrogram.attrs.copy()
+    units = attrs.get(ArrayAttrs.units.value)
+    attrs[ArrayAttrs.units.value] = "dB" if units is None else f"{units} dB"
+
+    return spectrogram.copy(data=data).assign_attrs(attrs)
+
+
+def to_db_array(
+    array: np.ndarray,
+    min_db: float | None = -80.0,
+    max_db: float | None = None,
+    amin: float = 1e-10,
+) -> np.ndarray:
+    """Convert a power array to decibels.
+
+    The input is left untouched; the result is written into a single new
+    array of the same dtype.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        The power values to convert.
+    min_db : float | None
+        Values below this threshold are clamped to it. If None, no minimum
+        is applied.
+    max_db : float | None
+        Values above this threshold are clamped to it. If None, no maximum
+        is applied.
+    amin : float
+        Values below this threshold are raised to it before taking the
+        logarithm.
+
+    Returns
+    -------
+    np.ndarray
+        The values in decibels.
+
+    """
+    data = np.maximum(array, array.dtype.type(amin))
+    np.log10(data, out=data)
+    data *= 10
+
+    if min_db is not None or max_db is not None:
+        np.clip(data, min_db, max_db, out=data)
+
+    return data
+
+
+def normalize_array(
+    array: np.ndarray,
+    min_val: float | None = None,
+    max_val: float | None = None,
+) -> np.ndarray:
+    """Normalize array values to [0, 1] in place.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        The array to normalize. It is overwritten with the result.
+    min_val : float | None
+        Value mapped to 0. If None, the minimum of the array is used.
+    max_val : float | None
+        Value mapped to 1. If None, the maximum of the array is used.
+
+    Returns
+    -------
+    np.ndarray
+        The normalized array.
+
+    """
+    if min_val is None:
+        min_val = array.min()
+
+    if max_val is None:
+        max_val = array.max()
+
+    array_range = max_val - min_val
+
+    if array_range == 0:
+        # If all values are the same, return zeros.
+        array[...] = 0
+        return array
+
+    array -= min_val
+    array *= 1 / array_range
+    return array
+
+
+def pcen_array(
+    array: np.ndarray,
+    axis: int = 1,
+    smooth: float = 0.025,
+    gain: float = 0.98,
+    bias: float = 2,
+    power: float = 0.5,
+    eps: float = 1e-6,
+) -> np.ndarray:
+    """Apply Per-Channel Energy Normalization (PCEN) to a spectrogram array.
+
+    Computes the same transform as ``soundevent.audio.pcen`` with the same
+    defaults, but on the raw array and in its dtype. The smoother is a
+    first-order IIR filter along the time axis, run by ``scipy.signal.lfilter``
+    for all frequency bins at once. The remaining steps run in place on the
+    filter output, so the input is left untouched.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        The spectrogram values.
+    axis : int
+        The time axis of the array.
+    smooth : float
+        The time constant for smoothing the input spectrogram.
+    gain : float
+        The gain factor for the PCEN transform.
+    bias : float
+        The bias factor for the PCEN transform.
+    power : float
+        The power factor for the PCEN transform.
+    eps : float
+        An epsilon value to prevent division by zero.
+
+    Returns
+    -------
+    np.ndarray
+        The spectrogram with PCEN applied.
+
+    """
+    dtype = array.dtype.type
+    data = signal.lfilter([dtype(smooth)], [dtype(1), dtype(smooth - 1)], array, axis=axis)
+
+    # (eps + S) ** -gain
+    data += dtype(eps)
+    np.log(data, out=data)
+    data *= dtype(-gain)
+    np.exp(data, out=data)
+
+    # bias ** power * ((X * (eps + S) ** -gain / bias + 1) ** power - 1)
+    data *= array
+    data /= dtype(bias)
+    np.log1p(data, out=data)
+    data *= dtype(power)
+    np.expm1(data, out=data)
+    data *= dtype(bias**power)
+    return data
+
 
 def normalize_spectrogram(
     spectrogram: xr.DataArray,
@@ -43,23 +274,205 @@ def normalize_spectrogram(
     -------
     xr.DataArray
         Normalized array.
+
     """
     attrs = spectrogram.attrs
-    min_val = attrs.get("min_dB")
-    if min_val is None or relative:
-        min_val = spectrogram.min()
+    min_val = None if relative else attrs.get("min_dB")
+    max_val = None if relative else attrs.get("max_dB")
 
-    max_val = attrs.get("max_dB")
-    if max_val is None or relative:
-        max_val = spectrogram.max()
+    # Normalize a single copy in place instead of allocating intermediates
+    normalized = spectrogram.copy()
+    normalize_array(normalized.data, min_val=min_val, max_val=max_val)
+    return normalized
 
-    array_range = max_val - min_val
 
-    if array_range == 0:
-        # If all values are the same, return zeros.
-        return spectrogram * 0
+BOUNDARY_PAD_MODES: dict[str, dict] = {
+    "zeros": {"mode": "constant"},
+    "odd": {"mode": "reflect", "reflect_type": "odd"},
+    "even": {"mode": "reflect"},
+    "constant": {"mode": "edge"},
+}
+
+
+@lru_cache(maxsize=32)
+def _get_window(window_type: str, window_size_samples: int) -> np.ndarray:
+    """Return a cached STFT window of the given type and size.
+
+    The window is stored as a contiguous float32 array to match the
+    single-precision frames, and made read-only as it is shared between
+    calls.
+    """
+    window = np.ascontiguousarray(signal.get_window(window_type, window_size_samples), dtype=np.float32)
+    window.setflags(write=False)
+    return window
+
+
+@lru_cache(maxsize=32)
+def _get_scaled_window(
+    window_type: str,
+    window_size_samples: int,
+    scaling: Literal["psd", "spectrum"],
+    samplerate: float,
+    dtype: np.dtype,
+) -> np.ndarray:
+    """Return a cached STFT window with the spectral scaling folded in.
+
+    Multiplying the frames by this window gives the same result as scaling
+    the STFT afterwards, as scipy does, without the extra pass. The window
+    is read-only as it is shared between calls.
+    """
+    window = _get_window(window_type, window_size_samples)
+    if scaling == "psd":
+        scale = 1.0 / (samplerate * np.square(window, dtype=np.float64).sum())
+    else:
+        scale = 1.0 / window.sum(dtype=np.float64) ** 2
+
+    window = (window * np.sqrt(scale)).astype(dtype, copy=False)
+    window.setflags(write=False)
+    return window
+
+
+def _stft(
+    data: np.ndarray,
+    samplerate: float,
+    window_size_samples: int,
+    hop_size_samples: int,
+    window_type: str = "hann",
+    axis: int = 0,
+    detrend: Union[str, Callable, Literal[False]] = False,
+    padded: bool = True,
+    boundary: Optional[Literal["zeros", "odd", "even", "constant"]] = "zeros",
+    scaling: Literal["psd", "spectrum"] = "psd",
+    reduce: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute a one-sided STFT of a real signal.
+
+    Mirrors ``scipy.signal.stft`` for real input, but frames the signal
+    with a strided view, applies the window (with the scaling folded into
+    it) to the real frames and runs a single real-input FFT. This skips the
+    complex window multiplication, the separate scaling pass and the final
+    dtype copy that scipy performs.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Real valued signal.
+    samplerate : float
+        Sample rate of the signal in Hz.
+    window_size_samples : int
+        Number of samples in each window. Clamped to the signal length.
+    hop_size_samples : int
+        Number of samples between consecutive frames.
+    window_type : str
+        Window passed to scipy.signal.get_window.
+    axis : int
+        Axis of ``data`` that holds the samples.
+    detrend : Union[str, Callable, Literal[False]]
+        How to detrend each frame. Callables receive the frames with the
+        samples on the last axis.
+    padded : bool
+        Whether to zero-pad the end of the signal to fit a whole number of
+        frames.
+    boundary : Optional[Literal["zeros", "odd", "even", "constant"]]
+        How to extend the signal by half a window on both sides.
+    scaling : Literal["psd", "spectrum"]
+        Whether to scale for a power spectral density or a spectrum.
+    reduce : Optional[Callable[[np.ndarray], np.ndarray]]
+        Elementwise function applied to each block of the complex STFT,
+        such as a magnitude. Applying it per block avoids materializing the
+        complex STFT of the whole signal.
+
+    Returns
+    -------
+    frequencies : np.ndarray
+        Frequency of each bin in Hz.
+    times : np.ndarray
+        Time of each frame centre in seconds, relative to the signal start.
+    stft : np.ndarray
+        Complex STFT, or its reduction if ``reduce`` is given. The sample
+        axis is replaced by the frequency axis and a new trailing axis holds
+        the frames.
+
+    """
+    axis = axis % data.ndim
+    samples = np.moveaxis(data, axis, -1)
+
+    # Like scipy, shrink the window to the signal length but keep the overlap.
+    noverlap = window_size_samples - hop_size_samples
+    nperseg = min(window_size_samples, samples.shape[-1])
+    hop_size_samples = nperseg - noverlap
+    if hop_size_samples < 1:
+        raise ValueError("noverlap must be less than nperseg")
+
+    # Pad for the boundary and to a whole number of frames. Both are zeros
+    # with the default boundary, so the signal is copied only once then.
+    edge = nperseg // 2 if boundary is not None else 0
+    nadd = 0
+    if padded:
+        nadd = (-(samples.shape[-1] + 2 * edge - nperseg) % hop_size_samples) % nperseg
 
-    return (spectrogram - min_val) / array_range
+    if boundary is not None and boundary != "zeros":
+        pad_width = [(0, 0)] * (samples.ndim - 1) + [(edge, edge)]
+        samples = np.pad(samples, pad_width, **BOUNDARY_PAD_MODES[boundary])
+        edge = 0
+
+    if edge or nadd:
+        pad_width = [(0, 0)] * (samples.ndim - 1) + [(edge, edge + nadd)]
+        samples = np.pad(samples, pad_width)
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, nperseg, axis=-1)
+    frames = frames[..., ::hop_size_samples, :]
+
+    if detrend:
+        frames = signal.detrend(frames, type=detrend, axis=-1) if isinstance(detrend, str) else detrend(frames)
+
+    # scipy.fft keeps the plans of recently used lengths, so repeated
+    # requests with the same window size reuse the same FFT plan. The
+    # windowed frames are a private copy, so the FFT may use them as scratch.
+    window = _get_scaled_window(window_type, nperseg, scaling, float(samplerate), frames.dtype)
+
+    # Transform the frames in blocks so the windowed copy and the complex
+    # intermediate stay bounded (and cache friendly) however long the
+    # signal is. Each block is reduced straight into the output.
+    nframes = frames.shape[-2]
+    batch = frames[..., 0, 0].size
+    block = max(1, STFT_BLOCK_BYTES // (batch * nperseg * frames.itemsize))
+    stft = None
+    for start in range(0, nframes, block):
+        chunk = frames[..., start : start + block, :]
+        workers = -1 if chunk.size >= PARALLEL_FFT_MIN_SAMPLES else None
+        result = fft.rfft(chunk * window, axis=-1, workers=workers, overwrite_x=True)
+        if reduce is not None:
+            result = reduce(result)
+        if stft is None:
+            if block >= nframes:
+                stft = result
+                break
+            stft = np.empty((*result.shape[:-2], nframes, result.shape[-1]), dtype=result.dtype)
+        stft[..., start : start + block, :] = result
+
+    # Move the frequency axis back to where the samples were and keep the
+    # frames on the last axis.
+    stft = np.moveaxis(np.moveaxis(stft, -1, -2), -2, axis)
+
+    frequencies = fft.rfftfreq(nperseg, 1 / samplerate)
+    times = np.arange(stft.shape[-1]) * hop_size_samples / samplerate
+    if boundary is None:
+        times += nperseg / 2 / samplerate
+
+    return frequencies, times, stft
+
+
+def _power(stft: np.ndarray) -> np.ndarray:
+    """Compute the squared magnitude of a complex STFT.
+
+    Squaring the real and imaginary parts avoids the square root that
+    ``np.abs`` computes only for it to be undone by squaring. The squared
+    imaginary part is added in place, so only one temporary is allocated.
+    """
+    power = np.square(stft.real)
+    power += np.square(stft.imag)
+    return power
 
 
 def compute_spectrogram_from_samples(
@@ -122,45 +535,51 @@ def compute_spectrogram_from_samples(
     samplerate = 1 / get_dim_step(audio, Dimensions.time.value)
     time_axis: int = audio.get_axis_num(Dimensions.time.value)  # type: ignore
 
-    # Calculate overlap from window and hop sizes
-    noverlap = window_size_samples - hop_size_samples
+    # Spectrograms are only displayed, so single precision is plenty and
+    # halves the memory traffic of every step that follows.
+    samples = audio.data.astype(np.float32, copy=False)
 
-    # Compute the spectrogram
-    frequencies, times, spectrogram = signal.stft(
-        audio.data,
-        fs=samplerate,
-        window=window_type,
-        nperseg=window_size_samples,
-        noverlap=noverlap,
-        return_onesided=True,
+    # Compute the spectrogram, reducing the complex STFT block by block
+    reduce = np.abs if scale == "amplitude" else _power
+    frequencies, times, spectrogram = _stft(
+        samples,
+        samplerate,
+        window_size_samples,
+        hop_size_samples,
+        window_type=window_type,
         axis=time_axis,
-        detrend=detrend,  # type: ignore
+        detrend=detrend,
         padded=padded,
-        boundary=boundary,  # type: ignore
+        boundary=boundary,
         scaling="psd" if scale == "psd" else "spectrum",
+        reduce=reduce,
     )
 
     original_units = audio.attrs.get(ArrayAttrs.units.value, "V")
     if scale == "psd":
-        # Compute the power spectral density
-        spectrogram = np.abs(spectrogram) ** 2
         long_name = "Power Spectral Density Spectrogram"
         units = f"{original_units}**2/Hz"
     elif scale == "amplitude":
-        spectrogram = np.abs(spectrogram)
         long_name = "Amplitude Spectrogram"
         units = f"{original_units}"
     elif scale == "power":
-        spectrogram = np.abs(spectrogram) ** 2
         long_name = "Power Spectrogram"
         units = f"{original_units}**2"
     else:
         raise ValueError(f"Invalid scale option {scale}. Choose one of: psd, amplitude, power")
 
+    # A custom detrend callable may promote the frames to double precision;
+    # keep the stored spectrogram in single precision regardless. This is a
+    # no-op for the usual float32 result.
+    spectrogram = spectrogram.astype(np.float32, copy=False)
+
     # Calculate hop size in seconds for metadata
     hop_size = hop_size_samples / samplerate
     window_size = window_size_samples / samplerate
 
+    # Frame times are a fresh array, so shift them to the audio start in place
+    times += audio.time.data[0]
+
     dims = (
         *[name if name != Dimensions.time.value else Dimensions.frequency.value for name in audio.dims],
         Dimensions.time.value,
@@ -175,7 +594,7 @@ def compute_spectrogram_from_samples(
                 step=samplerate / window_size_samples,
             ),
             Dimensions.time.value: create_time_dim_from_array(
-                times + audio.time.data[0],
+                times,
                 step=hop_size,
             ),
             Dimensions.channel.value: audio.channel,
@@ -1,7 +1,16 @@
 """Export functionality for the Sonari application."""
 
-from .router import export_router
-
 __all__ = [
     "export_router",
 ]
+
+
+def __getattr__(name: str):
+    # The router is only imported when it is accessed, so submodules such as
+    # the chart generation can be imported on their own (e.g. by worker
+    # processes) without loading the routes and services the router needs
+    if name == "export_router":
+        from .router import export_router
+
+        return export_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,6 @@
 """Chart generation modules for export functionality."""
 
-from .chart_utils import generate_night_buckets, generate_time_buckets
+from .chart_utils import generate_night_buckets, generate_time_buckets, group_events_by_time_bucket
 from .time_series_chart import generate_time_series_chart
 from .yearly_activity_chart import generate_yearly_activity_heatmap
 
@@ -9,4 +9,5 @@ __all__ = [
     "generate_yearly_activity_heatmap",
     "generate_time_buckets",
     "generate_night_buckets",
+    "group_events_by_time_bucket",
 ]
@@ -1,11 +1,40 @@
 """Chart utility functions for export functionality."""
 
 import datetime
+import itertools
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
 from ..constants import ExportConstants
 
+NIGHT_START_TIME = datetime.time(ExportConstants.NIGHT_START_HOUR, 0)
+NIGHT_END_TIME = datetime.time(ExportConstants.NIGHT_END_HOUR, 0)
+
+# Length in seconds of each predefined time period
+PREDEFINED_PERIOD_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "night": 12 * 3600,  # 12 hours (6PM-6AM)
+    "day": 24 * 3600,
+    "week": 7 * 24 * 3600,
+    "overall": None,  # Special case
+}
+
+# Length in seconds of each unit of a custom time period
+CUSTOM_PERIOD_UNIT_SECONDS = {
+    "seconds": 1,
+    "minutes": 60,
+    "hours": 3600,
+    "days": 24 * 3600,
+    "weeks": 7 * 24 * 3600,
+    "months": 30 * 24 * 3600,  # Approximate
+    "years": 365 * 24 * 3600,  # Approximate
+}
+
 
 def generate_time_buckets(
     events_with_datetime: List[Dict[str, Any]],
@@ -30,49 +59,70 @@ def generate_time_buckets(
     if time_period_type == "predefined" and predefined_period == "night":
         return generate_night_buckets(start_datetime, end_datetime)
 
-    # Generate regular time buckets
-    buckets = []
-    current = start_datetime
-
-    while current < end_datetime:
-        bucket_end = current + timedelta(seconds=period_seconds)
-        if bucket_end > end_datetime:
-            bucket_end = end_datetime
-        buckets.append((current, bucket_end))
-        current = bucket_end
+    # Generate regular time buckets. The number of buckets is known upfront,
+    # so compute every edge from the start instead of stepping through them;
+    # the last bucket is clipped to the end of the range.
+    period = timedelta(seconds=period_seconds)
+    num_buckets = -((start_datetime - end_datetime) // period)
+    edges = [start_datetime + i * period for i in range(num_buckets)]
+    edges.append(end_datetime)
 
-    return buckets
+    return list(itertools.pairwise(edges))
 
 
 def generate_night_buckets(
     start_datetime: datetime.datetime, end_datetime: datetime.datetime
 ) -> List[Tuple[datetime.datetime, datetime.datetime]]:
     """Generate night-only buckets (6PM-6AM)."""
-    buckets = []
-    current_date = start_datetime.date()
-    end_date = end_datetime.date()
+    # Start with the night that was still running at start_datetime, if any,
+    # and visit each night of the range exactly once.
+    first_date = start_datetime.date()
+    if start_datetime.time() < NIGHT_END_TIME:
+        first_date -= timedelta(days=1)
+    num_nights = (end_datetime.date() - first_date).days + 1
 
-    while current_date <= end_date:
-        # Night starts at 6PM of current day
-        night_start = datetime.datetime.combine(current_date, datetime.time(ExportConstants.NIGHT_START_HOUR, 0))
-        # Night ends at 6AM of next day
+    buckets = []
+    for day in range(num_nights):
+        night_date = first_date + timedelta(days=day)
+        # Night starts at 6PM of the day and ends at 6AM of the next day
+        night_start = datetime.datetime.combine(night_date, NIGHT_START_TIME, tzinfo=start_datetime.tzinfo)
         night_end = datetime.datetime.combine(
-            current_date + timedelta(days=1), datetime.time(ExportConstants.NIGHT_END_HOUR, 0)
+            night_date + timedelta(days=1), NIGHT_END_TIME, tzinfo=start_datetime.tzinfo
         )
 
-        # Only include if within our overall range
-        if night_end >= start_datetime and night_start <= end_datetime:
-            # Clip to actual data range
-            actual_start = max(night_start, start_datetime)
-            actual_end = min(night_end, end_datetime)
-            if actual_start < actual_end:
-                buckets.append((actual_start, actual_end))
-
-        current_date += timedelta(days=1)
+        # Clip to actual data range
+        actual_start = max(night_start, start_datetime)
+        actual_end = min(night_end, end_datetime)
+        if actual_start < actual_end:
+            buckets.append((actual_start, actual_end))
 
     return buckets
 
 
+def group_events_by_time_bucket(
+    events: List[Dict[str, Any]], time_buckets: List[Tuple[datetime.datetime, datetime.datetime]]
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Group events by the index of the time bucket they fall into.
+
+    Every event is dispatched to its bucket in a single pass over the events:
+    the last bucket starting at or before it, found by bisection, unless the
+    event is at or past that bucket's end (between night buckets, or at the
+    end of the last bucket). Groups are in bucket order, empty buckets are
+    left out, and the events of a group keep their original order.
+    """
+    bucket_starts = [bucket_start for bucket_start, _ in time_buckets]
+
+    events_by_bucket: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for event in events:
+        event_datetime = event["datetime"]
+        bucket_index = bisect_right(bucket_starts, event_datetime) - 1
+        if bucket_index >= 0 and event_datetime < time_buckets[bucket_index][1]:
+            events_by_bucket[bucket_index].append(event)
+
+    return dict(sorted(events_by_bucket.items()))
+
+
+@lru_cache(maxsize=64)
 def convert_time_period_to_seconds(
     time_period_type: str,
     predefined_period: str | None,
@@ -81,28 +131,10 @@ def convert_time_period_to_seconds(
 ) -> int | None:
     """Convert time period to seconds. Returns None for 'overall' period."""
     if time_period_type == "predefined":
-        predefined_map = {
-            "second": 1,
-            "minute": 60,
-            "hour": 3600,
-            "night": 12 * 3600,  # 12 hours (6PM-6AM)
-            "day": 24 * 3600,
-            "week": 7 * 24 * 3600,
-            "overall": None,  # Special case
-        }
-        return predefined_map.get(predefined_period)
+        return PREDEFINED_PERIOD_SECONDS.get(predefined_period)
     else:
         # Convert custom periods
         if custom_period_value is None or custom_period_unit is None:
             return 60  # Default to 1 minute
 
-        unit_map = {
-            "seconds": 1,
-            "minutes": 60,
-            "hours": 3600,
-            "days": 24 * 3600,
-            "weeks": 7 * 24 * 3600,
-            "months": 30 * 24 * 3600,  # Approximate
-            "years": 365 * 24 * 3600,  # Approximate
-        }
-        return custom_period_value * unit_map.get(custom_period_unit, 1)
+        return custom_period_value * CUSTOM_PERIOD_UNIT_SECONDS.get(custom_period_unit, 1)
@@ -1,17 +1,23 @@
 """Unified time series chart generation for exports."""
 
 import base64
-import datetime
 from collections import defaultdict
 from io import BytesIO
 from typing import Any, Dict, List
 
 import matplotlib
+import numpy as np
 
 matplotlib.use("Agg")  # Use non-interactive backend
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
+# Legend names of the statuses that are displayed differently than they are stored
+STATUS_LABELS = {
+    "assigned": "unsure",
+    "completed": "accepted",
+}
+
 
 def generate_time_series_chart(
     datetime_data: List[Dict[str, Any]],
@@ -40,7 +46,9 @@ def generate_time_series_chart(
         return ""
 
     # Group data by species, status, and time periods
-    species_status_data = defaultdict(lambda: defaultdict(lambda: {"periods": [], "counts": []}))
+    species_status_data: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(
+        lambda: defaultdict(lambda: defaultdict(int))
+    )
 
     for data_entry in all_data:
         species = data_entry["species_tag"]
@@ -52,8 +60,7 @@ def generate_time_series_chart(
         else:  # events
             count = data_entry["event_count"]
 
-        species_status_data[species][status]["periods"].append(time_period)
-        species_status_data[species][status]["counts"].append(count)
+        species_status_data[species][status][time_period] += count
 
     # Create the chart
     plt.style.use("default")
@@ -61,21 +68,15 @@ def generate_time_series_chart(
 
     # Get unique time periods and species-status combinations
     # Separate datetime periods from "No Date" periods
-    datetime_periods = []
-    no_date_periods = []
-
+    unique_periods = set()
     for species_data in species_status_data.values():
-        for status_data in species_data.values():
-            for period in status_data["periods"]:
-                if period == "No Date":
-                    if period not in no_date_periods:
-                        no_date_periods.append(period)
-                else:
-                    if period not in datetime_periods:
-                        datetime_periods.append(period)
+        for period_to_count in species_data.values():
+            unique_periods.update(period_to_count)
 
     # Sort datetime periods, keep "No Date" periods at the end
-    datetime_periods.sort()
+    no_date_periods = ["No Date"] if "No Date" in unique_periods else []
+    unique_periods.discard("No Date")
+    datetime_periods = sorted(unique_periods)
     all_periods = datetime_periods + no_date_periods
 
     # Get unique species and statuses for organizing stacked bars
@@ -100,61 +101,49 @@ def generate_time_series_chart(
 
     # Bar width and positions - one bar per species per time period
     bar_width = 0.8 / len(unique_species) if unique_species else 0.8
-    x_positions = range(len(all_periods))
+    x_positions = np.arange(len(all_periods), dtype=np.float64)
+    species_x_positions_matrix = x_positions + bar_width * np.arange(len(unique_species))[:, None]
+    period_index = {period: j for j, period in enumerate(all_periods)}
 
     # Plot stacked bars for each species
     for i, species in enumerate(unique_species):
         species_data = species_status_data[species]
         color = species_colors[species]
 
-        # Calculate x positions for this species
-        species_x_positions = [x + i * bar_width for x in x_positions]
+        # X positions for this species
+        species_x_positions = species_x_positions_matrix[i]
 
-        # Initialize bottom values for stacking (start at 0 for each time period)
-        bottom_values = [0] * len(all_periods)
-
-        # Stack bars for each status within this species
-        for status in all_statuses:
-            if status not in species_data:
-                continue
+        # Counts matrix of shape (statuses, time periods), 0 for missing periods
+        counts_matrix = np.zeros((len(all_statuses), len(all_periods)), dtype=np.int64)
+        for k, status in enumerate(all_statuses):
+            for period, count in species_data.get(status, {}).items():
+                counts_matrix[k, period_index[period]] = count
 
-            data = species_data[status]
-            hatch = status_hatches.get(status, "...")
+        # Each status is stacked on top of the statuses before it
+        bottom_matrix = np.cumsum(counts_matrix, axis=0) - counts_matrix
 
-            # Create counts array for all time periods (0 for missing periods)
-            counts_for_periods = []
-            for period in all_periods:
-                if period in data["periods"]:
-                    idx = data["periods"].index(period)
-                    counts_for_periods.append(data["counts"][idx])
-                else:
-                    counts_for_periods.append(0)
+        # Stack bars for each status within this species
+        for k, status in enumerate(all_statuses):
+            counts_for_periods = counts_matrix[k]
 
             # Only create a bar if there are non-zero counts
-            if any(count > 0 for count in counts_for_periods):
-                # Create label for legend
-                label = (
-                    f"{species} ({status.replace('assigned', 'unsure').replace('completed', 'accepted')})"
-                    if status != "no_status"
-                    else species
-                )
-
-                # Create stacked bar
-                ax.bar(
-                    species_x_positions,
-                    counts_for_periods,
-                    bar_width,
-                    label=label,
-                    color=color,
-                    alpha=0.8,
-                    hatch=hatch,
-                    bottom=bottom_values,
-                )
-
-                # Update bottom values for next stack layer
-                bottom_values = [
-                    bottom + count for bottom, count in zip(bottom_values, counts_for_periods, strict=True)
-                ]
+            if not (counts_for_periods > 0).any():
+                continue
+
+            # Create label for legend
+            label = f"{species} ({STATUS_LABELS.get(status, status)})" if status != "no_status" else species
+
+            # Create stacked bar
+            ax.bar(
+                species_x_positions,
+                counts_for_periods,
+                bar_width,
+                label=label,
+                color=color,
+                alpha=0.8,
+                hatch=status_hatches.get(status, "..."),
+                bottom=bottom_matrix[k],
+            )
 
     # Customize the chart
     ax.set_xlabel("Time Period", fontsize=12)
@@ -169,21 +158,19 @@ def generate_time_series_chart(
         ax.set_title(title, fontsize=14)
 
     # Set x-axis labels
-    ax.set_xticks([x + bar_width * (len(unique_species) - 1) / 2 for x in x_positions])
-
-    # Format time period labels
-    period_labels = []
-    for period in all_periods:
-        if period == "No Date":
-            period_labels.append("No Date/Time")
-        else:
-            try:
-                # Try to parse and format the datetime
-                dt = datetime.datetime.strptime(period, "%Y-%m-%d %H:%M:%S")
-                period_labels.append(dt.strftime("%m/%d %H:%M"))
-            except (ValueError, TypeError):
-                # Fallback to original string
-                period_labels.append(period[:10] if len(period) > 10 else period)
+    ax.set_xticks(x_positions + bar_width * (len(unique_species) - 1) / 2)
+
+    # Format time period labels. Periods are formatted with the fixed layout of
+    # ExportConstants.TIME_PERIOD_FORMAT ("YYYY-MM-DD HH:MM:SS"), so the label
+    # ("MM/DD HH:MM") is sliced out of the string instead of parsing it. Periods
+    # of a different shape fall back to (the start of) the original string.
+    period_labels = [
+        f"{period[5:7]}/{period[8:10]} {period[11:16]}"
+        if len(period) == 19 and period[4] == period[7] == "-" and period[10] == " "
+        else period[:10]
+        for period in datetime_periods
+    ]
+    period_labels += ["No Date/Time"] * len(no_date_periods)
 
     ax.set_xticklabels(period_labels, rotation=45, ha="right")
 
@@ -205,16 +192,17 @@ def generate_time_series_chart(
     # Add grid for better readability
     ax.grid(True, alpha=0.3)
 
-    # Tight layout to prevent label cutoff
-    plt.tight_layout()
+    # Tight layout to prevent label cutoff; the layout engine also makes room
+    # for the legend, so the figure only needs to be laid out once on save
+    fig.set_layout_engine("tight")
 
-    # Save to buffer
+    # Save to buffer, with fast PNG compression since the result is base64 encoded anyway
     buffer = BytesIO()
-    plt.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
-    buffer.seek(0)
+    plt.savefig(buffer, format="png", dpi=100, pil_kwargs={"compress_level": 1})
 
-    # Convert to base64
-    chart_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+    # Convert to base64 straight from the buffer's memory instead of a copy of it
+    with buffer.getbuffer() as view:
+        chart_base64 = base64.b64encode(view).decode("ascii")
 
     # Clean up
     plt.close(fig)
@@ -2,17 +2,23 @@
 
 import base64
 import calendar
-from collections import defaultdict
 from io import BytesIO
 from typing import Any, Dict, List
 
-import matplotlib
 import numpy as np
 from astral import LocationInfo
-from astral.sun import sun
+from matplotlib import colormaps
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
 
-matplotlib.use("Agg")  # Use non-interactive backend
-import matplotlib.pyplot as plt
+# Day of year (1-based, in the non-leap reference year 2023) that each month
+# starts on, followed by the day after the end of December
+_MONTH_FIRST_DAY = np.concatenate(([1], 1 + np.cumsum([calendar.monthrange(2023, m)[1] for m in range(1, 13)])))
+
+# Hour of day ticks of every subplot
+_HOUR_TICKS = [0, 6, 12, 18, 23]
+_HOUR_TICK_LABELS = [f"{h:02d}:00" for h in _HOUR_TICKS]
 
 
 def generate_yearly_activity_heatmap(
@@ -20,6 +26,8 @@ def generate_yearly_activity_heatmap(
     project_name: str,
     species_tags: List[str],
     location_data: Dict[str, Any] | None = None,
+    dpi: int = 100,
+    compress_level: int = 1,
 ) -> str:
     """Generate a yearly activity heatmap with subplots for each species tag.
 
@@ -27,6 +35,9 @@ def generate_yearly_activity_heatmap(
         yearly_activity_data: Data with hour_of_day, day_of_year, and event_count
         project_name: Name of the project to include in chart title
         species_tags: List of species tags to create subplots for
+        location_data: Location used to draw sunrise and sunset lines
+        dpi: Resolution of the rendered PNG
+        compress_level: zlib compression level (0-9) of the PNG; low levels encode much faster
 
     Returns
     -------
@@ -35,11 +46,18 @@ def generate_yearly_activity_heatmap(
     if not yearly_activity_data or not species_tags:
         return ""
 
-    # Group data by species tag
-    data_by_species = defaultdict(list)
-    for data_entry in yearly_activity_data:
-        species = data_entry["species_tag"]
-        data_by_species[species].append(data_entry)
+    # Extract the data into parallel columns, with each species tag mapped to
+    # its index in the heatmap stack (-1 for tags without a subplot)
+    species_to_idx = {species_tag: i for i, species_tag in enumerate(species_tags)}
+    num_entries = len(yearly_activity_data)
+    species_idx = np.fromiter(
+        (species_to_idx.get(entry["species_tag"], -1) for entry in yearly_activity_data),
+        dtype=np.intp,
+        count=num_entries,
+    )
+    hours = np.fromiter((entry["hour_of_day"] for entry in yearly_activity_data), dtype=np.intp, count=num_entries)
+    days = np.fromiter((entry["day_of_year"] for entry in yearly_activity_data), dtype=np.intp, count=num_entries)
+    counts = np.fromiter((entry["event_count"] for entry in yearly_activity_data), dtype=np.int64, count=num_entries)
 
     # Determine subplot layout (try to make it roughly square)
     num_species = len(species_tags)
@@ -56,7 +74,10 @@ def generate_yearly_activity_heatmap(
         cols = int(np.ceil(num_species / rows))
 
     # Create figure with subplots
-    fig, axes = plt.subplots(rows, cols, figsize=(4 * cols, 3 * rows))
+    # The figure is created without pyplot, so it is not registered globally,
+    # is safe to render from any thread and is freed once it goes out of scope
+    fig = Figure(figsize=(4 * cols, 3 * rows), layout="constrained")
+    axes = fig.subplots(rows, cols)
     fig.suptitle(f"{project_name}", va="top", fontsize=14)
 
     # Handle single subplot case
@@ -68,87 +89,58 @@ def generate_yearly_activity_heatmap(
         axes = axes.flatten()
 
     # Find global min/max for consistent color scale across subplots
-    all_counts = [entry["event_count"] for entry in yearly_activity_data]
-    if all_counts:
-        global_min, global_max = min(all_counts), max(all_counts)
-        # Ensure we have a range for the colorbar
-        if global_min == global_max:
-            global_max = global_min + 1
-    else:
-        global_min, global_max = 0, 1
-
-    # Determine the month range for this project (across all species)
-    project_min_day = float("inf")
-    project_max_day = 0
+    global_min, global_max = counts.min().item(), counts.max().item()
+    # Ensure we have a range for the colorbar
+    if global_min == global_max:
+        global_max = global_min + 1
 
-    # Look at all species data for this project to find the full day range
-    for species_data_all in data_by_species.values():
-        for data_entry in species_data_all:
-            day = data_entry["day_of_year"]
-            project_min_day = min(project_min_day, day)
-            project_max_day = max(project_max_day, day)
+    # One colour mapping shared by all subplots and the colorbar
+    norm = Normalize(vmin=global_min, vmax=global_max)
+    cmap = colormaps["viridis"]
 
-    # If no data at all, default to showing January (day 1-31)
-    if project_min_day == float("inf"):
-        project_min_day = 1
-        project_max_day = 31
+    # Determine the month range for this project (across all species)
+    project_min_day = days.min().item()
+    project_max_day = days.max().item()
 
     # Convert days to months and find month boundaries
-    def day_to_month(day_of_year):
-        """Convert day of year to month number (1-12)."""
-        cumulative = 0
-        for month in range(1, 13):
-            month_days = calendar.monthrange(2023, month)[1]
-            if day_of_year <= cumulative + month_days:
-                return month
-            cumulative += month_days
-        return 12  # Fallback to December
-
-    project_min_month = day_to_month(project_min_day)
-    project_max_month = day_to_month(project_max_day)
+    project_min_month = _day_to_month(project_min_day)
+    project_max_month = _day_to_month(project_max_day)
 
     # Calculate the first and last day of the month range
-    def month_to_first_day(month):
-        """Get first day of year for given month."""
-        cumulative = 1
-        for m in range(1, month):
-            cumulative += calendar.monthrange(2023, m)[1]
-        return cumulative
-
-    def month_to_last_day(month):
-        """Get last day of year for given month."""
-        return month_to_first_day(month) + calendar.monthrange(2023, month)[1] - 1
-
-    start_day_idx = month_to_first_day(project_min_month) - 1  # Convert to 0-based indexing
-    end_day_idx = month_to_last_day(project_max_month)
+    start_day_idx = _month_to_first_day(project_min_month) - 1  # Convert to 0-based indexing
+    end_day_idx = _month_to_last_day(project_max_month)
+
+    # Month ticks of the month range, relative to the display range
+    months = np.arange(project_min_month, project_max_month + 1)
+    month_starts = _MONTH_FIRST_DAY[months - 1] - (start_day_idx + 1)  # +1 to convert back from 0-based
+    month_labels = [calendar.month_abbr[month] for month in months]
+
+    # Fill one 24x366 matrix per species (handle leap years, max days) with
+    # event counts in a single scatter. Single precision holds counts exactly
+    # up to 2**24 and halves the memory the colormapping has to go through.
+    heatmap_matrices = np.zeros((len(species_to_idx), 24, 366), dtype=np.float32)
+    valid = (species_idx >= 0) & (hours >= 0) & (hours < 24) & (days >= 1) & (days <= 366)
+    heatmap_matrices[species_idx[valid], hours[valid], days[valid] - 1] = counts[valid]  # 0-based days
+
+    # Sun times only depend on the location and day range, so they are
+    # calculated once and drawn on every subplot
+    sunrise_sunset_times = (
+        _calculate_sunrise_sunset(location_data, start_day_idx, end_day_idx) if location_data else None
+    )
 
     # Create heatmap for each species
     for i, species_tag in enumerate(species_tags):
         ax = axes[i]
-        species_data = data_by_species[species_tag]
-
-        # Create 24x366 matrix (handle leap years, max days)
-        heatmap_matrix = np.zeros((24, 366))
-
-        # Fill matrix with event counts
-        for data_entry in species_data:
-            hour = data_entry["hour_of_day"]
-            day = data_entry["day_of_year"] - 1  # Convert to 0-based indexing
-            count = data_entry["event_count"]
-
-            if 0 <= hour < 24 and 0 <= day < 366:
-                heatmap_matrix[hour, day] = count
 
         # Extract the relevant slice of the heatmap for this project's day range
-        heatmap_display = heatmap_matrix[:, start_day_idx:end_day_idx]
+        heatmap_display = heatmap_matrices[species_to_idx[species_tag], :, start_day_idx:end_day_idx]
 
         # Create heatmap
-        im = ax.imshow(
+        ax.imshow(
             heatmap_display,
-            # cmap="coolwarm",
+            cmap=cmap,
+            norm=norm,
             aspect="auto",
-            vmin=global_min,
-            vmax=global_max,
             origin="lower",
         )
 
@@ -163,33 +155,17 @@ def generate_yearly_activity_heatmap(
         # Determine if this is a bottom row subplot
         is_bottom_row = i >= num_species - (num_species % cols if num_species % cols != 0 else cols)
 
-        # Generate month ticks for the month range
-        month_starts = []
-        month_labels = []
-
-        for month in range(project_min_month, project_max_month + 1):
-            # Calculate the start day of this month relative to our display range
-            month_first_day = month_to_first_day(month)
-            relative_start = month_first_day - (start_day_idx + 1)  # +1 to convert back from 0-based
-
-            month_starts.append(relative_start)
-            month_labels.append(calendar.month_abbr[month])
-
-        ax.set_xticks(month_starts)
-        ax.set_xticklabels(month_labels)
+        ax.set_xticks(month_starts, labels=month_labels)
 
         # Set x-axis label only for bottom row subplots
         if is_bottom_row:
             ax.set_xlabel("Month")
 
         # Set y-axis ticks (hours)
-        hour_ticks = [0, 6, 12, 18, 23]
-        ax.set_yticks(hour_ticks)
-        ax.set_yticklabels([f"{h:02d}:00" for h in hour_ticks])
+        ax.set_yticks(_HOUR_TICKS, labels=_HOUR_TICK_LABELS)
 
         # Add sunrise/sunset lines if location data is available
-        if location_data:
-            sunrise_sunset_times = _calculate_sunrise_sunset(location_data, start_day_idx, end_day_idx)
+        if sunrise_sunset_times is not None:
             _draw_sunrise_sunset_lines(ax, sunrise_sunset_times, start_day_idx)
 
         # Add grid for better readability
@@ -199,86 +175,109 @@ def generate_yearly_activity_heatmap(
     for i in range(num_species, len(axes)):
         axes[i].set_visible(False)
 
-    # Adjust layout first to make room for colorbar
-    plt.tight_layout(pad=1, h_pad=2, w_pad=2)  # Increase padding between subplots
-    plt.subplots_adjust(top=1.5, bottom=0.25)  # Make more room for suptitle and horizontal colorbar
-
     # Add horizontal colorbar at the bottom, centered
-    cbar = fig.colorbar(im, ax=axes[:num_species], orientation="horizontal", shrink=0.6, aspect=30, pad=0.1)
+    cbar = fig.colorbar(
+        ScalarMappable(norm=norm, cmap=cmap),
+        ax=axes[:num_species],
+        orientation="horizontal",
+        shrink=0.6,
+        aspect=30,
+        pad=0.1,
+    )
     cbar.set_label("Event Count", labelpad=10)
 
     # Save to buffer
     buffer = BytesIO()
-    plt.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
-    buffer.seek(0)
+    fig.savefig(buffer, format="png", dpi=dpi, pil_kwargs={"compress_level": compress_level})
 
-    # Convert to base64
-    chart_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+    # Convert to base64 straight from the buffer's memory instead of a copy of it
+    with buffer.getbuffer() as view:
+        chart_base64 = base64.b64encode(view).decode("ascii")
 
     # Clean up
-    plt.close(fig)
     buffer.close()
 
     return chart_base64
 
 
+def _day_to_month(day_of_year: int) -> int:
+    """Convert day of year to month number (1-12)."""
+    month = int(np.searchsorted(_MONTH_FIRST_DAY, day_of_year, side="right"))
+    return min(max(month, 1), 12)  # Clamp out of range days to January and December
+
+
+def _month_to_first_day(month: int) -> int:
+    """Get first day of year for given month."""
+    return int(_MONTH_FIRST_DAY[month - 1])
+
+
+def _month_to_last_day(month: int) -> int:
+    """Get last day of year for given month."""
+    return int(_MONTH_FIRST_DAY[month]) - 1
+
+
 def _calculate_sunrise_sunset(
     location_data: Dict[str, Any], start_day_idx: int, end_day_idx: int
-) -> Dict[int, Dict[str, float]]:
-    """Calculate sunrise and sunset times for each day in the range."""
-    import datetime
-
-    sunrise_sunset_times = {}
+) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """Calculate sunrise and sunset times (UTC hours) for each day in the range.
 
+    Uses the NOAA solar position approximation on the whole day range at
+    once. Days on which the sun does not rise or set are left out.
+    """
     # Create observer based on location data
     if "latitude" in location_data and "longitude" in location_data:
         observer = LocationInfo(latitude=location_data["latitude"], longitude=location_data["longitude"]).observer
     elif "timezone" in location_data:
         observer = LocationInfo(timezone=location_data["timezone"]).observer
     else:
-        return {}
-
-    # Calculate for each day in the range
-    days_calculated = 0
-    for day_of_year in range(start_day_idx + 1, end_day_idx + 1):  # Convert back to 1-based
-        try:
-            # Convert day of year to date (using 2023 as reference year)
-            date = datetime.datetime(2023, 1, 1) + datetime.timedelta(days=day_of_year - 1)
-
-            # Calculate sun times
-            s = sun(observer, date=date.date())
-
-            # Convert to hours (0-24)
-            sunrise_hour = s["sunrise"].hour + s["sunrise"].minute / 60.0
-            sunset_hour = s["sunset"].hour + s["sunset"].minute / 60.0
+        return None
+
+    days = np.arange(start_day_idx + 1, end_day_idx + 1)  # Convert back to 1-based
+    latitude = np.radians(observer.latitude)
+
+    # Fractional year, equation of time (minutes) and solar declination (radians)
+    gamma = 2 * np.pi / 365 * (days - 1)
+    eqtime = 229.18 * (
+        0.000075
+        + 0.001868 * np.cos(gamma)
+        - 0.032077 * np.sin(gamma)
+        - 0.014615 * np.cos(2 * gamma)
+        - 0.040849 * np.sin(2 * gamma)
+    )
+    decl = (
+        0.006918
+        - 0.399912 * np.cos(gamma)
+        + 0.070257 * np.sin(gamma)
+        - 0.006758 * np.cos(2 * gamma)
+        + 0.000907 * np.sin(2 * gamma)
+        - 0.002697 * np.cos(3 * gamma)
+        + 0.00148 * np.sin(3 * gamma)
+    )
+
+    # Hour angle (degrees) of the sun at the horizon, accounting for refraction.
+    # It is NaN on days without sunrise or sunset.
+    with np.errstate(invalid="ignore"):
+        hour_angle = np.degrees(
+            np.arccos(np.cos(np.radians(90.833)) / (np.cos(latitude) * np.cos(decl)) - np.tan(latitude) * np.tan(decl))
+        )
 
-            sunrise_sunset_times[day_of_year] = {"sunrise": sunrise_hour, "sunset": sunset_hour}
-            days_calculated += 1
-        except Exception:
-            continue
+    # Convert to hours (0-24)
+    sunrise_hours = np.mod(720 - 4 * (observer.longitude + hour_angle) - eqtime, 1440) / 60
+    sunset_hours = np.mod(720 - 4 * (observer.longitude - hour_angle) - eqtime, 1440) / 60
 
-    return sunrise_sunset_times
+    valid = ~np.isnan(hour_angle)
+    return days[valid], sunrise_hours[valid], sunset_hours[valid]
 
 
-def _draw_sunrise_sunset_lines(ax, sunrise_sunset_times: Dict[int, Dict[str, float]], start_day_idx: int):
+def _draw_sunrise_sunset_lines(ax, sunrise_sunset_times: tuple[np.ndarray, np.ndarray, np.ndarray], start_day_idx: int):
     """Draw sunrise and sunset lines on the heatmap."""
-    if not sunrise_sunset_times:
+    days, sunrise_hours, sunset_hours = sunrise_sunset_times
+    if not days.size:
         return
 
-    days = []
-    sunrise_hours = []
-    sunset_hours = []
-
-    for day_of_year, times in sunrise_sunset_times.items():
-        # Convert day to relative position in the display range
-        relative_day = day_of_year - start_day_idx - 1  # Convert to 0-based relative position
-        days.append(relative_day)
-        sunrise_hours.append(times["sunrise"])
-        sunset_hours.append(times["sunset"])
+    # Convert days to relative positions in the display range
+    relative_days = days - start_day_idx - 1  # Convert to 0-based relative position
 
     # Draw lines
-    if days and sunrise_hours:
-        ax.plot(days, sunrise_hours, color="black")
-
-    if days and sunset_hours:
-        ax.plot(days, sunset_hours, color="black")
+    ax.plot(relative_days, sunrise_hours, color="black")
+    ax.plot(relative_days, sunset_hours, color="black")
@@ -5,7 +5,10 @@ class ExportConstants:
     """Constants used across export functions."""
 
     DEFAULT_BATCH_SIZE = 1000
+    FILE_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # Exported files up to 8 MiB are kept in memory
+    FILE_STREAM_CHUNK_SIZE = 64 * 1024
     DEFAULT_DATE_FORMAT = "DD.MM.YYYY"
+    TIME_PERIOD_FORMAT = "%Y-%m-%d %H:%M:%S"  # Start and end of time buckets in exports
     DEFAULT_EVENT_COUNT = 2
     NIGHT_START_HOUR = 18  # 6PM
     NIGHT_END_HOUR = 6  # 6AM
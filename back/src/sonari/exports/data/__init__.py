@@ -1,16 +1,24 @@
 """Data layer for export functionality."""
 
-from .extractors import extract_annotation_data, extract_batch, load_status_badges_for_batch
+from .extractors import (
+    extract_annotation_rows,
+    stream_annotations,
+)
 from .processors import extract_bounding_box_coordinates, extract_events_with_datetime
-from .query_builder import build_status_filters, get_filtered_annotation_tasks, resolve_project_ids
+from .query_builder import (
+    build_status_filters,
+    get_filtered_annotation_tasks,
+    get_task_tag_values,
+    resolve_project_ids,
+)
 
 __all__ = [
     "resolve_project_ids",
     "build_status_filters",
     "get_filtered_annotation_tasks",
-    "extract_batch",
-    "load_status_badges_for_batch",
-    "extract_annotation_data",
+    "get_task_tag_values",
+    "stream_annotations",
+    "extract_annotation_rows",
     "extract_bounding_box_coordinates",
     "extract_events_with_datetime",
 ]
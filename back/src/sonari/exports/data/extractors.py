@@ -1,13 +1,17 @@
 """Data extraction utilities for exports."""
 
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import Select, select
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
 
+from .processors import extract_bounding_box_coordinates
 from sonari import models
 from sonari.routes.dependencies import Session
 
+# Annotation features that are exported as columns of their own
+FEATURE_COLUMNS = ("media_duration", "detection_confidence", "species_confidence")
+
 
 def recording_station(recording: models.Recording) -> str:
     """Return a deterministic station label for a recording.
@@ -24,12 +28,10 @@ def recording_station(recording: models.Recording) -> str:
     return str(recording.path)
 
 
-async def extract_batch(
-    session: Session, project_ids: List[int], offset: int, batch_size: int
-) -> List[models.SoundEventAnnotation]:
-    """Extract a batch of sound event annotations filtered by project IDs."""
+def _annotations_query(project_ids: List[int]) -> Select:
+    """Build the query of the exported sound event annotations of the projects, in ID order."""
     # Query sound event annotations that belong to the specified projects
-    stmt = (
+    return (
         select(models.SoundEventAnnotation)
         .join(models.AnnotationTask)
         .filter(models.AnnotationTask.annotation_project_id.in_(project_ids))
@@ -41,123 +43,110 @@ async def extract_batch(
             .joinedload(models.DatasetRecording.dataset),
             selectinload(models.SoundEventAnnotation.tags),
             joinedload(models.SoundEventAnnotation.created_by),
-            joinedload(models.SoundEventAnnotation.annotation_task)
+            # The task is already joined for the project filter, so populate it from that join
+            contains_eager(models.SoundEventAnnotation.annotation_task)
             .selectinload(models.AnnotationTask.status_badges)
             .joinedload(models.AnnotationStatusBadge.user),
-            joinedload(models.SoundEventAnnotation.annotation_task).selectinload(models.AnnotationTask.tags),
+            contains_eager(models.SoundEventAnnotation.annotation_task).selectinload(models.AnnotationTask.tags),
         )
         .order_by(models.SoundEventAnnotation.id.asc())
-        .offset(offset)
-        .limit(batch_size)
     )
 
-    result = await session.execute(stmt)
-    batch_annotations = result.unique().scalars().all()
 
-    return batch_annotations
+async def stream_annotations(
+    session: Session, project_ids: List[int], batch_size: int
+) -> AsyncIterator[List[models.SoundEventAnnotation]]:
+    """Stream the sound event annotations of the projects in batches.
 
+    All annotations are read with a single query whose rows are fetched from
+    a server-side cursor ``batch_size`` at a time, so only one batch is held
+    in memory and no batch has to seek to where the previous one ended. The
+    relationships of each batch are eager loaded as it is fetched.
+    """
+    stmt = _annotations_query(project_ids).execution_options(yield_per=batch_size)
 
-async def load_status_badges_for_batch(session: Session, annotations: List[models.SoundEventAnnotation]) -> None:
-    """Load status badges separately to avoid complex nested joins."""
-    # Get all annotation task IDs from the batch
-    task_ids = []
-    for annotation in annotations:
-        if annotation.annotation_task:
-            task_ids.append(annotation.annotation_task.id)
+    result = await session.stream_scalars(stmt)
+    async for batch_annotations in result.partitions():
+        yield batch_annotations
 
-    if not task_ids:
-        return
 
-    # Load status badges for all tasks in one query
-    badges_stmt = (
-        select(models.AnnotationStatusBadge)
-        .options(joinedload(models.AnnotationStatusBadge.user))
-        .filter(models.AnnotationStatusBadge.annotation_task_id.in_(task_ids))
-    )
-
-    await session.execute(badges_stmt)
+def _extract_recording_fields(recording: models.Recording) -> Dict[str, Any]:
+    """Extract the export fields that only depend on the recording."""
+    return {
+        "filename": str(recording.path),
+        "station": recording_station(recording),
+        "date": recording.date.strftime("%Y-%m-%d") if recording.date else None,
+        "time": recording.time.strftime("%H:%M:%S") if recording.time else None,
+        "longitude": recording.longitude,
+        "latitude": recording.latitude,
+    }
 
 
-async def extract_annotation_data(annotation: models.SoundEventAnnotation) -> Dict[str, Any]:
-    """Extract data from a single sound event annotation."""
-    recording = annotation.recording
+def _extract_task_fields(annotation_task: models.AnnotationTask | None) -> Dict[str, str]:
+    """Extract the export fields that only depend on the annotation task."""
+    if annotation_task is None:
+        return {"task_status_badges": "", "task_tags": ""}
 
-    station = recording_station(recording)
+    # Extract task status badges per user
+    status_badges = {}
+    for badge in annotation_task.status_badges:
+        username = badge.user.username if badge.user else "system"
+        status_badges[username] = badge.state.value
 
-    # Extract filename
-    filename = str(recording.path)
+    return {
+        "task_status_badges": ", ".join(f"{user}:{status}" for user, status in status_badges.items()),
+        # Extract annotation task tags (key: value)
+        "task_tags": ", ".join(f"{tag.key}: {tag.value}" for tag in annotation_task.tags),
+    }
 
-    # Extract sound event tags
-    sound_event_tags = [tag.value for tag in annotation.tags]
-    sound_event_tags_str = ", ".join(sound_event_tags)
 
+def _build_annotation_row(
+    annotation: models.SoundEventAnnotation,
+    recording_fields: Dict[str, Any],
+    task_fields: Dict[str, str],
+) -> Dict[str, Any]:
+    """Combine the fields of one annotation with its recording and task fields."""
     # Extract individual features into separate fields
-    features = {
-        "media_duration": None,
-        "detection_confidence": None,
-        "species_confidence": None,
-    }
-
+    features = dict.fromkeys(FEATURE_COLUMNS)
     for feature_rel in annotation.features:
-        feature_name = feature_rel.name
-        feature_value = feature_rel.value
-
-        # Map feature names to our standardized column names
-        if feature_name == "media_duration":
-            features["media_duration"] = feature_value
-        elif feature_name == "detection_confidence":
-            features["detection_confidence"] = feature_value
-        elif feature_name == "species_confidence":
-            features["species_confidence"] = feature_value
+        if feature_rel.name in features:
+            features[feature_rel.name] = feature_rel.value
 
     # Extract bounding box coordinates from geometry
-    from .processors import extract_bounding_box_coordinates
+    bbox_coords = extract_bounding_box_coordinates(annotation.geometry)
 
-    geometry = annotation.geometry
-    bbox_coords = extract_bounding_box_coordinates(geometry)
+    return {
+        **recording_fields,
+        "sound_event_tags": ", ".join(tag.value for tag in annotation.tags),
+        **features,
+        **bbox_coords,
+        # Extract user who created the sound event
+        "user": annotation.created_by.username if annotation.created_by else None,
+        **task_fields,
+        "geometry_type": annotation.geometry_type,
+    }
 
-    # Extract user who created the sound event
-    created_by_user = annotation.created_by.username if annotation.created_by else None
 
-    # Extract task status badges per user
-    status_badges = {}
-    if annotation.annotation_task:
-        for badge in annotation.annotation_task.status_badges:
-            username = badge.user.username if badge.user else "system"
-            status_badges[username] = badge.state.value
-
-    status_badges_str = ", ".join([f"{user}:{status}" for user, status in status_badges.items()])
-
-    # Extract annotation task tags (key: value)
-    task_tags_str = ""
-    if annotation.annotation_task and annotation.annotation_task.tags:
-        task_tags_str = ", ".join(
-            f"{tag.key}: {tag.value}" for tag in annotation.annotation_task.tags
-        )
+def extract_annotation_rows(annotations: List[models.SoundEventAnnotation]) -> List[Dict[str, Any]]:
+    """Extract data from a batch of sound event annotations with loaded relationships.
+
+    Annotations of the same recording or annotation task share the fields
+    derived from it, so these are extracted once per recording and task.
+    """
+    recording_fields: Dict[int, Dict[str, Any]] = {}
+    task_fields: Dict[int | None, Dict[str, str]] = {}
 
-    # Extract recording fields (date, time, longitude, latitude)
-    recording_date = recording.date.strftime("%Y-%m-%d") if recording.date else None
-    recording_time = recording.time.strftime("%H:%M:%S") if recording.time else None
-    recording_longitude = recording.longitude
-    recording_latitude = recording.latitude
+    rows = []
+    for annotation in annotations:
+        recording = annotation.recording
+        if recording.id not in recording_fields:
+            recording_fields[recording.id] = _extract_recording_fields(recording)
 
-    return {
-        "filename": filename,
-        "station": station,
-        "date": recording_date,
-        "time": recording_time,
-        "longitude": recording_longitude,
-        "latitude": recording_latitude,
-        "sound_event_tags": sound_event_tags_str,
-        "media_duration": features["media_duration"],
-        "detection_confidence": features["detection_confidence"],
-        "species_confidence": features["species_confidence"],
-        "start_time": bbox_coords["start_time"],
-        "lower_frequency": bbox_coords["lower_frequency"],
-        "end_time": bbox_coords["end_time"],
-        "higher_frequency": bbox_coords["higher_frequency"],
-        "user": created_by_user,
-        "task_status_badges": status_badges_str,
-        "task_tags": task_tags_str,
-        "geometry_type": annotation.geometry_type,
-    }
+        annotation_task = annotation.annotation_task
+        task_id = annotation_task.id if annotation_task else None
+        if task_id not in task_fields:
+            task_fields[task_id] = _extract_task_fields(annotation_task)
+
+        rows.append(_build_annotation_row(annotation, recording_fields[recording.id], task_fields[task_id]))
+
+    return rows
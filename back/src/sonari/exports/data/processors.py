@@ -6,66 +6,80 @@ from collections import defaultdict
 from typing import Any, Dict, List, Tuple
 
 from sqlalchemy import and_, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, selectinload
 
-from ..utils.tag_utils import extract_tag_set, extract_tag_values_from_selected, find_matching_tags
+from ..utils.tag_utils import extract_tag_set, extract_tag_values_from_selected, find_matching_tag_set
 from sonari import models
 from sonari.routes.dependencies import Session
 
+_NO_COORDINATES = (None, None, None, None)
+
+
+def _bounding_box_coordinates(coordinates) -> tuple:
+    # Format: start_time, lower_frequency, end_time, higher_frequency
+    if len(coordinates) < 4:
+        return _NO_COORDINATES
+    start_time, lower_frequency, end_time, higher_frequency = coordinates[:4]
+    return start_time, lower_frequency, end_time, higher_frequency
+
+
+def _time_stamp_coordinates(coordinates) -> tuple:
+    # Single point in time - only start_time available
+    return coordinates, None, coordinates, None
+
+
+def _time_interval_coordinates(coordinates) -> tuple:
+    # Time interval - start and end time only
+    if len(coordinates) < 2:
+        return _NO_COORDINATES
+    start_time, end_time = coordinates[:2]
+    return start_time, None, end_time, None
+
+
+def _point_coordinates(coordinates) -> tuple:
+    # Point with time and frequency, so start/end and lower/higher are the same
+    if len(coordinates) < 2:
+        return _NO_COORDINATES
+    time, frequency = coordinates[:2]
+    return time, frequency, time, frequency
+
+
+def _generic_coordinates(coordinates) -> tuple:
+    # Generic coordinates - try to extract what we can
+    if not isinstance(coordinates, (list, tuple)):
+        return _NO_COORDINATES
+    if len(coordinates) >= 4:
+        return _bounding_box_coordinates(coordinates)
+    if len(coordinates) >= 2:
+        return _time_interval_coordinates(coordinates)
+    return _NO_COORDINATES
+
+
+# Coordinate extractor of each geometry type, returning
+# (start_time, lower_frequency, end_time, higher_frequency)
+_COORDINATE_EXTRACTORS = {
+    "BoundingBox": _bounding_box_coordinates,
+    "TimeStamp": _time_stamp_coordinates,
+    "TimeInterval": _time_interval_coordinates,
+    "Point": _point_coordinates,
+}
+
 
 def extract_bounding_box_coordinates(geometry) -> dict:
     """Extract individual bounding box coordinates from geometry object."""
-    # Initialize coordinate values
-    coords = {
-        "start_time": None,
-        "lower_frequency": None,
-        "end_time": None,
-        "higher_frequency": None,
-    }
-
     try:
-        if hasattr(geometry, "coordinates"):
-            # Handle different geometry types
-            if geometry.type == "BoundingBox":
-                # Format: start_time, lower_frequency, end_time, higher_frequency
-                bbox_coords = geometry.coordinates
-                if len(bbox_coords) >= 4:
-                    coords["start_time"] = bbox_coords[0]
-                    coords["lower_frequency"] = bbox_coords[1]
-                    coords["end_time"] = bbox_coords[2]
-                    coords["higher_frequency"] = bbox_coords[3]
-            elif geometry.type == "TimeStamp":
-                # Single point in time - only start_time available
-                coords["start_time"] = geometry.coordinates
-                coords["end_time"] = geometry.coordinates
-            elif geometry.type == "TimeInterval":
-                # Time interval - start and end time only
-                interval_coords = geometry.coordinates
-                if len(interval_coords) >= 2:
-                    coords["start_time"] = interval_coords[0]
-                    coords["end_time"] = interval_coords[1]
-            elif geometry.type == "Point":
-                # Point with time and frequency
-                point_coords = geometry.coordinates
-                if len(point_coords) >= 2:
-                    coords["start_time"] = point_coords[0]
-                    coords["end_time"] = point_coords[0]  # Same start/end for point
-                    coords["lower_frequency"] = point_coords[1]
-                    coords["higher_frequency"] = point_coords[1]  # Same lower/higher for point
-            else:
-                # Generic coordinates - try to extract what we can
-                if isinstance(geometry.coordinates, (list, tuple)) and len(geometry.coordinates) >= 4:
-                    coords["start_time"] = geometry.coordinates[0]
-                    coords["lower_frequency"] = geometry.coordinates[1]
-                    coords["end_time"] = geometry.coordinates[2]
-                    coords["higher_frequency"] = geometry.coordinates[3]
-                elif isinstance(geometry.coordinates, (list, tuple)) and len(geometry.coordinates) >= 2:
-                    coords["start_time"] = geometry.coordinates[0]
-                    coords["end_time"] = geometry.coordinates[1]
-    except Exception as e:
+        extractor = _COORDINATE_EXTRACTORS.get(geometry.type, _generic_coordinates)
+        start_time, lower_frequency, end_time, higher_frequency = extractor(geometry.coordinates)
+    except (AttributeError, IndexError, TypeError, ValueError) as e:
         logging.getLogger(__name__).warning(f"Could not extract coordinates from geometry: {e}")
+        start_time = lower_frequency = end_time = higher_frequency = None
 
-    return coords
+    return {
+        "start_time": start_time,
+        "lower_frequency": lower_frequency,
+        "end_time": end_time,
+        "higher_frequency": higher_frequency,
+    }
 
 
 async def extract_events_with_datetime(
@@ -103,66 +117,62 @@ async def extract_events_with_datetime(
     filters = [models.AnnotationTask.annotation_project_id.in_(project_ids)]
     filters.extend(build_status_filters(statuses))
 
-    # Get annotation tasks with all necessary relationships loaded
+    # Filter by the recording date in the database. Recordings without a date
+    # never match, so only events with a date are returned when filtering.
+    if start_date:
+        filters.append(models.Recording.date >= start_date)
+    if end_date:
+        filters.append(models.Recording.date <= end_date)
 
+    # Get annotation tasks with all necessary relationships loaded. Every task
+    # has a recording, which is loaded from the same join the date filter uses.
     query = (
         select(models.AnnotationTask)
+        .join(models.AnnotationTask.recording)
         .where(and_(*filters))
         .options(
-            selectinload(models.AnnotationTask.annotation_project),
-            selectinload(models.AnnotationTask.recording),
+            contains_eager(models.AnnotationTask.recording),
             selectinload(models.AnnotationTask.sound_event_annotations).selectinload(models.SoundEventAnnotation.tags),
             selectinload(models.AnnotationTask.status_badges),
         )
     )
     result = await session.execute(query)
-    all_tasks = result.scalars().all()
-    tasks = (all_tasks, len(all_tasks))
+    tasks = result.scalars().all()
 
     events_with_datetime = []
     events_without_datetime = []
 
-    for task in tasks[0]:
+    # Values of the requested tags, extracted once for all events
+    requested_tag_values = frozenset(extract_tag_values_from_selected(tags))
+
+    for task in tasks:
+        recording = task.recording
+        recording_filename = str(recording.path)
+
+        # The datetime and status badges are the same for every event of the
+        # task, so they are computed once per task and shared by its events
+        recording_datetime = None
+        if recording.date:
+            recording_datetime = datetime.datetime.combine(recording.date, recording.time or datetime.time.min)
+
+        # Get status badges for this task, "no_status" if it has none. The
+        # first one is the status events are grouped by in the exports.
+        status_badges = [badge.state.value for badge in task.status_badges] or ["no_status"]
+        primary_status = status_badges[0]
+
         for sound_event_annotation in task.sound_event_annotations:
             # Check if this event has any of the requested tags
             event_tags = extract_tag_set(sound_event_annotation.tags)
-            matching_tags = find_matching_tags(event_tags, tags)
+            matching_tags = find_matching_tag_set(event_tags, requested_tag_values)
 
             if matching_tags:
-                recording = task.recording
-
-                # Access the project_id through the loaded relationship
-                task_project_id = task.annotation_project.id
-
-                # Combine recording date and time
-                recording_datetime = None
-                if recording.date:
-                    # Check if recording date is within the specified range
-                    if start_date and recording.date < start_date:
-                        continue  # Skip events before start_date
-                    if end_date and recording.date > end_date:
-                        continue  # Skip events after end_date
-
-                    if recording.time:
-                        recording_datetime = datetime.datetime.combine(recording.date, recording.time)
-                    else:
-                        recording_datetime = datetime.datetime.combine(recording.date, datetime.time.min)
-
-                # Get status badges for this task
-                status_badges = []
-                for badge in task.status_badges:
-                    status_badges.append(badge.state.value)
-
-                # If no status badges, use "no_status"
-                if not status_badges:
-                    status_badges = ["no_status"]
-
                 event_data = {
-                    "tags": list(event_tags),
-                    "recording_filename": str(recording.path),
-                    "project_id": task_project_id,
+                    "tags": event_tags,
+                    "recording_filename": recording_filename,
+                    "project_id": task.annotation_project_id,
                     "sound_event_annotation": sound_event_annotation,
                     "status_badges": status_badges,
+                    "primary_status": primary_status,
                     "recording": recording,  # Add recording directly for location data
                 }
 
@@ -170,9 +180,8 @@ async def extract_events_with_datetime(
                     event_data["datetime"] = recording_datetime
                     events_with_datetime.append(event_data)
                 else:
-                    # Event without date/time information (only include if no date filter)
-                    if not start_date and not end_date:
-                        events_without_datetime.append(event_data)
+                    # Event without date/time information (only returned if there is no date filter)
+                    events_without_datetime.append(event_data)
 
     return events_with_datetime, events_without_datetime
 
@@ -183,11 +192,12 @@ def group_events_by_species(
     """Group events by species tag."""
     events_by_species = defaultdict(list)
 
-    # Extract values from selected_tags (which come in "key:value" format)
-    selected_tag_values = extract_tag_values_from_selected(selected_tags)
+    # Extract values from selected_tags (which come in "key:value" format) into
+    # a set, so checking each event tag against them is a single hash lookup
+    selected_tag_values = set(extract_tag_values_from_selected(selected_tags))
 
     for event in events_with_datetime:
-        for tag in event["tags"]:  # tag is now just the value
+        for tag in event["tags"]:  # frozenset of the tag values
             if tag in selected_tag_values:
                 events_by_species[tag].append(event)
 
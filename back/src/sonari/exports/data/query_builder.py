@@ -1,5 +1,8 @@
 """Database query construction utilities for exports."""
 
+from collections import defaultdict
+from collections.abc import Collection
+
 from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import joinedload, selectinload
 
@@ -51,9 +54,17 @@ def build_status_filters(statuses: list[str] | None) -> list:
 
 
 async def get_filtered_annotation_tasks(
-    session: Session, project_ids: list[int], statuses: list[str] | None = None, additional_filters: list | None = None
+    session: Session,
+    project_ids: list[int],
+    statuses: list[str] | None = None,
+    additional_filters: list | None = None,
+    load_sound_event_annotations: bool = True,
 ) -> tuple[list[models.AnnotationTask], int]:
-    """Get annotation tasks with common filtering logic."""
+    """Get annotation tasks with common filtering logic.
+
+    The sound event annotations of the tasks, with their tags and features,
+    are only loaded if ``load_sound_event_annotations`` is set.
+    """
     filters = [models.AnnotationTask.annotation_project_id.in_(project_ids)]
 
     # Add status filters
@@ -72,15 +83,53 @@ async def get_filtered_annotation_tasks(
             .selectinload(models.Recording.recording_datasets)
             .joinedload(models.DatasetRecording.dataset),
             selectinload(models.AnnotationTask.status_badges).joinedload(models.AnnotationStatusBadge.user),
+            selectinload(models.AnnotationTask.notes),
+        )
+    )
+    if load_sound_event_annotations:
+        stmt = stmt.options(
             selectinload(models.AnnotationTask.sound_event_annotations).options(
                 selectinload(models.SoundEventAnnotation.tags),
                 selectinload(models.SoundEventAnnotation.features),
             ),
-            selectinload(models.AnnotationTask.notes),
         )
-    )
 
+    # Collections are loaded with separate SELECT ... IN queries and only
+    # to-one relationships are joined, so the rows need no de-duplication
     result = await session.execute(stmt)
-    tasks = result.unique().scalars().all()
+    tasks = result.scalars().all()
 
     return (tasks, len(tasks))
+
+
+async def get_task_tag_values(
+    session: Session, project_ids: list[int], tag_values: Collection[str], statuses: list[str] | None = None
+) -> dict[int, set[str]]:
+    """Get which of the tag values are on the sound event annotations of each annotation task.
+
+    The tags are matched and grouped by task in the database, which returns
+    one row per task and matching tag value instead of every annotation with
+    all of its tags. Tasks without a matching tag are left out.
+    """
+    filters = [
+        models.AnnotationTask.annotation_project_id.in_(project_ids),
+        models.Tag.value.in_(tag_values),
+    ]
+
+    # Add status filters
+    filters.extend(build_status_filters(statuses))
+
+    stmt = (
+        select(models.SoundEventAnnotation.annotation_task_id, models.Tag.value)
+        .join(models.SoundEventAnnotation.annotation_task)
+        .join(models.SoundEventAnnotation.tags)
+        .where(and_(*filters))
+        .group_by(models.SoundEventAnnotation.annotation_task_id, models.Tag.value)
+    )
+
+    result = await session.execute(stmt)
+    tag_values_by_task: dict[int, set[str]] = defaultdict(set)
+    for task_id, tag_value in result:
+        tag_values_by_task[task_id].add(tag_value)
+
+    return dict(tag_values_by_task)
@@ -48,6 +48,7 @@ async def export_passes(
     start_date: Annotated[str | None, Query()] = None,
     end_date: Annotated[str | None, Query()] = None,
     group_species: bool = False,
+    csv_only: bool = False,
 ):
     """Export passes analysis in CSV format or JSON with chart."""
     service = PassesService(session)
@@ -63,6 +64,7 @@ async def export_passes(
         start_date,
         end_date,
         group_species,
+        csv_only,
     )
 
 
@@ -1,14 +1,16 @@
 """Dump export service."""
 
+import asyncio
 import csv
 import logging
 from io import StringIO
-from typing import List
+from operator import itemgetter
+from typing import Any, Dict, List
 
 from fastapi.responses import StreamingResponse
 
 from ..constants import ExportConstants
-from ..data import extract_annotation_data, extract_batch, load_status_badges_for_batch
+from ..data import extract_annotation_rows, stream_annotations
 from ..utils import create_csv_streaming_response
 from .base import BaseExportService
 
@@ -26,69 +28,81 @@ class DumpService(BaseExportService):
         # Configuration
         batch_size = ExportConstants.DEFAULT_BATCH_SIZE
 
+        # Values of the CSV columns, in header order, of an annotation's extracted data
+        row_values = itemgetter(
+            "filename",
+            "station",
+            "date",
+            "time",
+            "longitude",
+            "latitude",
+            "sound_event_tags",
+            "task_tags",
+            "media_duration",
+            "detection_confidence",
+            "species_confidence",
+            "start_time",
+            "lower_frequency",
+            "end_time",
+            "higher_frequency",
+            "user",
+            "task_status_badges",
+            "geometry_type",
+        )
+
         async def generate_csv():
             """Generate CSV data progressively in batches."""
             try:
                 # CSV headers
                 headers = ExportConstants.DUMP_HEADERS
 
-                # Create CSV header row
+                # A single buffer and writer are reused for all rows; each yield
+                # sends what was written since the previous one
                 output = StringIO()
                 writer = csv.writer(output)
-                writer.writerow(headers)
-                yield output.getvalue()
-
-                # Process in batches
-                offset = 0
-
-                while True:
-                    batch_annotations = await extract_batch(self.session, project_ids, offset, batch_size)
-
-                    if not batch_annotations:
-                        break
 
-                    # Load status badges for this batch
-                    await load_status_badges_for_batch(self.session, batch_annotations)
+                def flush() -> str:
+                    chunk = output.getvalue()
+                    output.seek(0)
+                    output.truncate(0)
+                    return chunk
 
-                    # Process each annotation in the batch
-                    for annotation in batch_annotations:
+                # Create CSV header row
+                writer.writerow(headers)
+                yield flush()
+
+                def format_rows(batch_rows: List[Dict[str, Any]]) -> str:
+                    """Write the CSV rows of a whole batch and return them as one chunk."""
+                    writer.writerows(map(row_values, batch_rows))
+                    return flush()
+
+                # Process in batches, as they are fetched from a single streamed query.
+                # The ORM objects belong to the session, so the rows of a batch are
+                # extracted here on the event loop; only formatting the plain row data
+                # runs in a worker thread, while the next batch is fetched.
+                batches = stream_annotations(self.session, project_ids, batch_size)
+                next_batch = asyncio.ensure_future(anext(batches, None))
+                try:
+                    while (batch_annotations := await next_batch) is not None:
                         try:
-                            data = await extract_annotation_data(annotation)
-
-                            # Write CSV row
-                            output = StringIO()
-                            writer = csv.writer(output)
-                            writer.writerow([
-                                data["filename"],
-                                data["station"],
-                                data["date"],
-                                data["time"],
-                                data["longitude"],
-                                data["latitude"],
-                                data["sound_event_tags"],
-                                data["task_tags"],
-                                data["media_duration"],
-                                data["detection_confidence"],
-                                data["species_confidence"],
-                                data["start_time"],
-                                data["lower_frequency"],
-                                data["end_time"],
-                                data["higher_frequency"],
-                                data["user"],
-                                data["task_status_badges"],
-                                data["geometry_type"],
-                            ])
-                            yield output.getvalue()
-
+                            batch_rows = extract_annotation_rows(batch_annotations)
+                            next_batch = asyncio.ensure_future(anext(batches, None))
+                            chunk = await asyncio.to_thread(format_rows, batch_rows)
                         except Exception as e:
-                            logger.error(f"Error processing annotation {annotation.id}: {e}")
+                            logger.error(
+                                f"Error processing batch starting at annotation {batch_annotations[0].id}: {e}"
+                            )
                             raise e  # Stop processing on error as requested
-
-                    offset += batch_size
-
-                    # Break if we got fewer results than batch_size (end of data)
-                    if len(batch_annotations) < batch_size:
-                        break
+                        yield chunk
+                finally:
+                    # If the export ended early, let the fetch of the next batch finish
+                    # before closing the stream; cancelling it halfway through a query
+                    # would leave the session's connection unusable
+                    try:
+                        await next_batch
+                    except Exception as e:
+                        logger.error(f"Error fetching the next batch of the stopped export: {e}")
+                    await batches.aclose()
 
             except Exception as e:
                 logger.error(f"Error during CSV generation: {e}")
@@ -1,15 +1,15 @@
 """MultiBase export service."""
 
-from io import BytesIO
+from tempfile import SpooledTemporaryFile
 from typing import List
 
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from openpyxl import Workbook
 
 from ..constants import ExportConstants
 from ..data import get_filtered_annotation_tasks
 from ..data.extractors import recording_station
-from ..utils import DateFormatter, extract_tag_set, find_matching_tags
+from ..utils import DateFormatter, extract_tag_set, extract_tag_values_from_selected
 from .base import BaseExportService
 
 
@@ -21,96 +21,101 @@ class MultiBaseService(BaseExportService):
         annotation_project_ids: List[int],
         tags: List[str],
         statuses: List[str] | None = None,
-    ) -> Response:
+    ) -> StreamingResponse:
         """Export annotation projects in MultiBase format."""
         # Get the projects and their IDs
         project_ids, _ = await self.resolve_projects(annotation_project_ids)
 
         # Get annotation tasks with filtering
-        tasks = await get_filtered_annotation_tasks(self.session, project_ids, statuses)
+        tasks, _ = await get_filtered_annotation_tasks(self.session, project_ids, statuses)
 
-        # Create a new workbook and select the active sheet
-        wb = Workbook()
-        ws = wb.active
-        if ws is None:
-            return Response(status_code=422)
-        ws.title = "Beobachtungen"
+        # Create a new write-only workbook, which serializes each row as it is
+        # appended instead of keeping a cell object for every value in memory
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title="Beobachtungen")
 
         # Append the header to the excel file
         ws.append(ExportConstants.MULTIBASE_HEADERS)
 
-        for task in tasks[0]:
-            task_notes = "|"
-
-            for n in task.notes:
-                task_notes += f" {n.message} "
-                task_notes += "|"
+        # Values of the requested tags, extracted once for all annotations
+        selected_tag_values = extract_tag_values_from_selected(tags)
+
+        for task in tasks:
+            # Notes of the task as "| first | second |", or "|" without notes
+            task_notes = "| " + " | ".join(n.message for n in task.notes) + " |" if task.notes else "|"
+
+            # The columns between the species and the Bemerkung only depend on the
+            # task's recording, so they are the same for every row of the task
+            recording = task.recording
+            date_components = DateFormatter.extract_date_components(recording.date, "HH.MM.YYYY")
+            task_columns = (
+                date_components["date_str"],
+                date_components["day"],
+                date_components["month"],
+                date_components["year"],
+                "",  # Beobachter
+                "",  # Bestimmer
+                recording_station(recording),
+                recording.latitude,
+                recording.longitude,
+                "4326",
+                "Akustik",
+            )
 
             for sound_event_annotation in task.sound_event_annotations:
                 tag_set = extract_tag_set(sound_event_annotation.tags)
-                matching_tags = find_matching_tags(tag_set, tags)
+                # Rows are written in the order the tags were requested in
+                matching_tags = [tag for tag in selected_tag_values if tag in tag_set]
+
+                if not matching_tags:
+                    continue
+
+                # Extract detection and species probability from features
+                detection_prob = None
+                species_prob = None
+                for feature in sound_event_annotation.features:
+                    if feature.name == "detection_confidence":
+                        detection_prob = feature.value
+                    elif feature.name == "species_confidence":
+                        species_prob = feature.value
+
+                # Build Bemerkung field with probabilities and notes
+                bemerkung_parts = []
+                if detection_prob is not None or species_prob is not None:
+                    prob_str = f"Detection probability: {detection_prob}, Species probability: {species_prob}"
+                    bemerkung_parts.append(prob_str)
+                if task_notes and task_notes != "|":
+                    bemerkung_parts.append(task_notes)
+                bemerkung = " | ".join(bemerkung_parts) if bemerkung_parts else ""
 
                 for tag in matching_tags:
-                    species = tag.split(":")[-1]
-
-                    # Extract date components using DateFormatter
-                    date_components = DateFormatter.extract_date_components(task.recording.date, "HH.MM.YYYY")
-
-                    latitude = task.recording.latitude
-                    longitude = task.recording.longitude
-
-                    recording = task.recording
-                    station = recording_station(recording)
-
-                    # Extract detection and species probability from features
-                    detection_prob = None
-                    species_prob = None
-                    for feature in sound_event_annotation.features:
-                        if feature.name == "detection_confidence":
-                            detection_prob = feature.value
-                        elif feature.name == "species_confidence":
-                            species_prob = feature.value
-
-                    # Build Bemerkung field with probabilities and notes
-                    bemerkung_parts = []
-                    if detection_prob is not None or species_prob is not None:
-                        prob_str = f"Detection probability: {detection_prob}, Species probability: {species_prob}"
-                        bemerkung_parts.append(prob_str)
-                    if task_notes and task_notes != "|":
-                        bemerkung_parts.append(task_notes)
-                    bemerkung = " | ".join(bemerkung_parts) if bemerkung_parts else ""
+                    species = tag.rsplit(":", 1)[-1]
 
                     # Write the content to the worksheet
-                    ws.append([
-                        species,
-                        date_components["date_str"],
-                        date_components["day"],
-                        date_components["month"],
-                        date_components["year"],
-                        "",  # Beobachter
-                        "",  # Bestimmer
-                        station,
-                        latitude,
-                        longitude,
-                        "4326",
-                        "Akustik",
-                        bemerkung,
-                    ])
-
-        # Save the workbook to a BytesIO object
-        excel_file = BytesIO()
+                    ws.append((species, *task_columns, bemerkung))
+
+        # Save the workbook to a file that only moves to disk once it gets
+        # large, and stream that to the client instead of copying it in memory
+        excel_file = SpooledTemporaryFile(max_size=ExportConstants.FILE_SPOOL_MAX_SIZE)
         wb.save(excel_file)
+        file_size = excel_file.tell()
         excel_file.seek(0)
 
+        def iter_excel_file():
+            with excel_file:
+                while chunk := excel_file.read(ExportConstants.FILE_STREAM_CHUNK_SIZE):
+                    yield chunk
+
         # Generate the filename
         filename = f"{self.generate_filename('multibase')}.xlsx"
 
-        return Response(
-            excel_file.getvalue(),
+        return StreamingResponse(
+            iter_excel_file(),
             status_code=200,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={
                 "content-disposition": f"attachment; filename={filename}",
+                "content-length": str(file_size),
                 "content-type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             },
         )
@@ -2,17 +2,31 @@
 
 import csv
 import logging
-from collections import defaultdict
+from collections import Counter, defaultdict
 from io import StringIO
+from operator import itemgetter
 from typing import Any, Dict, List, Tuple
 
-from ..charts import generate_time_buckets, generate_time_series_chart
+from ..charts import generate_time_buckets, generate_time_series_chart, group_events_by_time_bucket
 from ..charts.chart_utils import convert_time_period_to_seconds
 from ..constants import BAT_GROUPS, ExportConstants
 from ..data import extract_events_with_datetime
 from ..data.processors import group_events_by_species
+from ..utils import create_csv_streaming_response
 from .base import BaseExportService
 
+# Columns of the passes CSV, which are also the keys of the passes data rows
+PASSES_CSV_HEADERS = (
+    "project_name",
+    "time_period_start",
+    "time_period_end",
+    "species_tag",
+    "status",
+    "event_count",
+    "pass_threshold",
+    "pass_count",
+)
+
 
 class PassesService(BaseExportService):
     """Service for passes analysis exports."""
@@ -30,8 +44,13 @@ class PassesService(BaseExportService):
         start_date: str | None = None,
         end_date: str | None = None,
         group_species: bool = False,
+        csv_only: bool = False,
     ):
-        """Export passes analysis in CSV format or JSON with chart."""
+        """Export passes analysis in CSV format or JSON with chart.
+
+        With ``csv_only``, the CSV is streamed as the response, one project at
+        a time, and no charts are generated.
+        """
         logger = logging.getLogger(__name__)
 
         # Get the projects and their IDs
@@ -45,15 +64,10 @@ class PassesService(BaseExportService):
         # Parse date range if provided
         parsed_start_date, parsed_end_date = self.parse_date_range(start_date, end_date)
 
-        all_passes_data = []
-        chart_images = []
-        project_names = []
-
-        # Process each project separately
-        for project_id in project_ids:
+        async def calculate_project_passes(project_id: int) -> List[Dict[str, Any]]:
+            """Calculate the passes data of one project."""
             project = projects_by_id[project_id]
             project_name = project.name
-            project_names.append(project_name)
 
             # Extract events for this specific project
             events_with_datetime, events_without_datetime = await extract_events_with_datetime(
@@ -89,6 +103,51 @@ class PassesService(BaseExportService):
                 )
                 project_passes_data.extend(passes_without_datetime)
 
+            return project_passes_data
+
+        # Values of the CSV columns of a passes data row
+        row_values = itemgetter(*PASSES_CSV_HEADERS)
+
+        if csv_only:
+
+            async def generate_csv():
+                """Generate CSV data progressively, one project at a time."""
+                try:
+                    # A single buffer and writer are reused for all rows; each yield
+                    # sends what was written since the previous one
+                    output = StringIO()
+                    writer = csv.writer(output)
+
+                    def flush() -> str:
+                        chunk = output.getvalue()
+                        output.seek(0)
+                        output.truncate(0)
+                        return chunk
+
+                    writer.writerow(PASSES_CSV_HEADERS)
+                    yield flush()
+
+                    for project_id in project_ids:
+                        writer.writerows(map(row_values, await calculate_project_passes(project_id)))
+                        yield flush()
+
+                except Exception as e:
+                    logger.error(f"Error during passes CSV generation: {e}")
+                    raise e
+
+            return create_csv_streaming_response(generate_csv, "passes")
+
+        all_passes_data = []
+        chart_images = []
+        project_names = []
+
+        # Process each project separately
+        for project_id in project_ids:
+            project_name = projects_by_id[project_id].name
+            project_names.append(project_name)
+
+            project_passes_data = await calculate_project_passes(project_id)
+
             # Generate chart for this project
             chart_base64 = generate_time_series_chart(
                 [d for d in project_passes_data if d["time_period_start"] != "No Date"],
@@ -111,31 +170,9 @@ class PassesService(BaseExportService):
             csv_output = StringIO()
             writer = csv.writer(csv_output)
 
-            # Write headers
-            headers = [
-                "project_name",
-                "time_period_start",
-                "time_period_end",
-                "species_tag",
-                "status",
-                "event_count",
-                "pass_threshold",
-                "pass_count",
-            ]
-            writer.writerow(headers)
-
-            # Write data rows
-            for pass_data in all_passes_data:
-                writer.writerow([
-                    pass_data["project_name"],
-                    pass_data["time_period_start"],
-                    pass_data["time_period_end"],
-                    pass_data["species_tag"],
-                    pass_data["status"],
-                    pass_data["event_count"],
-                    pass_data["pass_threshold"],
-                    pass_data["pass_count"],
-                ])
+            # Write headers and data rows
+            writer.writerow(PASSES_CSV_HEADERS)
+            writer.writerows(map(row_values, all_passes_data))
 
             csv_content = csv_output.getvalue()
             csv_output.close()
@@ -163,36 +200,32 @@ class PassesService(BaseExportService):
         """Calculate bat passes for each species in each time bucket, grouped by status."""
         passes_data = []
 
+        # Formatted start and end of each time bucket, shared by all species.
+        # Buckets are only formatted once they have events.
+        bucket_periods: Dict[int, Tuple[str, str]] = {}
+
         for species_tag, species_events in events_by_species.items():
-            for bucket_start, bucket_end in time_buckets:
-                # Find events in this time bucket
-                bucket_events = [event for event in species_events if bucket_start <= event["datetime"] < bucket_end]
-
-                # Group events by recording filename and status
-                events_by_recording_status = defaultdict(lambda: defaultdict(list))
-                for event in bucket_events:
-                    recording_filename = event["recording_filename"]
-                    # Use the first status badge for grouping (events can have multiple status badges)
-                    primary_status = event["status_badges"][0] if event["status_badges"] else "no_status"
-                    events_by_recording_status[primary_status][recording_filename].append(event)
+            # Dispatch each event to its time bucket in one pass
+            events_by_bucket = group_events_by_time_bucket(species_events, time_buckets)
+
+            for bucket_index, bucket_events in events_by_bucket.items():
+                period = bucket_periods.get(bucket_index)
+                if period is None:
+                    bucket_start, bucket_end = time_buckets[bucket_index]
+                    period = bucket_periods[bucket_index] = (
+                        bucket_start.strftime(ExportConstants.TIME_PERIOD_FORMAT),
+                        bucket_end.strftime(ExportConstants.TIME_PERIOD_FORMAT),
+                    )
+                period_start, period_end = period
 
                 # Calculate passes for each status
-                for status, recordings in events_by_recording_status.items():
-                    pass_count = 0
-                    total_event_count = 0
-
-                    for _, recording_events in recordings.items():
-                        event_count_in_recording = len(recording_events)
-                        total_event_count += event_count_in_recording
-
-                        # This recording constitutes a bat pass if it has >= threshold events
-                        if event_count_in_recording >= event_threshold:
-                            pass_count += 1
-
+                for status, total_event_count, pass_count in self._count_passes_by_status(
+                    bucket_events, event_threshold
+                ):
                     passes_data.append({
                         "project_name": project_name,
-                        "time_period_start": bucket_start.strftime("%Y-%m-%d %H:%M:%S"),
-                        "time_period_end": bucket_end.strftime("%Y-%m-%d %H:%M:%S"),
+                        "time_period_start": period_start,
+                        "time_period_end": period_end,
                         "species_tag": species_tag,
                         "status": status,
                         "event_count": total_event_count,  # Total events in time period
@@ -225,26 +258,8 @@ class PassesService(BaseExportService):
         passes_data = []
 
         for species_tag, species_events in events_by_species.items():
-            # Group events by recording filename and status
-            events_by_recording_status = defaultdict(lambda: defaultdict(list))
-            for event in species_events:
-                recording_filename = event["recording_filename"]
-                # Use the first status badge for grouping (events can have multiple status badges)
-                primary_status = event["status_badges"][0] if event["status_badges"] else "no_status"
-                events_by_recording_status[primary_status][recording_filename].append(event)
-
             # Calculate passes for each status
-            for status, recordings in events_by_recording_status.items():
-                pass_count = 0
-                total_event_count = sum(len(recording_events) for recording_events in recordings.values())
-
-                for _, recording_events in recordings.items():
-                    event_count_in_recording = len(recording_events)
-
-                    # This recording constitutes a bat pass if it has >= threshold events
-                    if event_count_in_recording >= event_threshold:
-                        pass_count += 1
-
+            for status, total_event_count, pass_count in self._count_passes_by_status(species_events, event_threshold):
                 passes_data.append({
                     "project_name": project_name,
                     "time_period_start": "No Date",
@@ -258,6 +273,25 @@ class PassesService(BaseExportService):
 
         return passes_data
 
+    def _count_passes_by_status(self, events: List[Dict[str, Any]], event_threshold: int) -> List[Tuple[str, int, int]]:
+        """Count the events and bat passes of each status, in the order the statuses first occur.
+
+        A recording constitutes a bat pass if it has at least ``event_threshold``
+        events of the status.
+        """
+        # Count the events of each status in each recording. Events can have
+        # multiple status badges, the first one is used for grouping.
+        recording_event_counts = Counter((event["primary_status"], event["recording_filename"]) for event in events)
+
+        counts_by_status: Dict[str, List[int]] = defaultdict(list)
+        for (status, _), event_count_in_recording in recording_event_counts.items():
+            counts_by_status[status].append(event_count_in_recording)
+
+        return [
+            (status, sum(counts), sum(count >= event_threshold for count in counts))
+            for status, counts in counts_by_status.items()
+        ]
+
     def _group_species_by_category(
         self, events_by_species: Dict[str, List[Dict[str, Any]]]
     ) -> Dict[str, List[Dict[str, Any]]]:
@@ -9,8 +9,8 @@ from typing import Any, Dict, List
 from fastapi.responses import StreamingResponse
 
 from ..constants import BAT_GROUPS
-from ..data import get_filtered_annotation_tasks
-from ..utils import create_csv_streaming_response, extract_tag_set, find_matching_tags
+from ..data import get_filtered_annotation_tasks, get_task_tag_values
+from ..utils import create_csv_streaming_response, extract_tag_values_from_selected
 from .base import BaseExportService
 from sonari import models
 
@@ -84,8 +84,14 @@ class StatsService(BaseExportService):
         group_species: bool = False,
     ) -> List[Dict[str, Any]]:
         """Get recording statistics grouped by project, status badge, and tag."""
-        # Get annotation tasks with all necessary relationships
-        tasks, _ = await get_filtered_annotation_tasks(self.session, project_ids, statuses)
+        # Get annotation tasks with all necessary relationships. Only the tags
+        # of their sound event annotations are needed, which are matched in the
+        # database instead of loading every annotation.
+        tasks, _ = await get_filtered_annotation_tasks(
+            self.session, project_ids, statuses, load_sound_event_annotations=False
+        )
+        requested_tag_values = frozenset(extract_tag_values_from_selected(tags))
+        tag_values_by_task = await get_task_tag_values(self.session, project_ids, requested_tag_values, statuses)
 
         # Dictionary to store statistics: (project_id, status_badge, tag) -> {count, duration}
         stats_dict = defaultdict(lambda: {"count": set(), "duration": 0.0})
@@ -104,12 +110,8 @@ class StatsService(BaseExportService):
             if not status_badges:
                 status_badges = ["no_status"]
 
-            # Get tags from sound event annotations
-            found_tags = set()
-            for sound_event_annotation in task.sound_event_annotations:
-                event_tags = extract_tag_set(sound_event_annotation.tags)
-                matching_tags = find_matching_tags(event_tags, tags)
-                found_tags.update(matching_tags)
+            # Get the requested tags of the task's sound event annotations
+            found_tags = tag_values_by_task.get(task.id, set())
 
             # Apply species grouping if requested
             if group_species:
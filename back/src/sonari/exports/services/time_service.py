@@ -6,9 +6,9 @@ from collections import defaultdict
 from io import StringIO
 from typing import Any, Dict, List, Tuple
 
-from ..charts import generate_time_buckets, generate_time_series_chart
+from ..charts import generate_time_buckets, generate_time_series_chart, group_events_by_time_bucket
 from ..charts.chart_utils import convert_time_period_to_seconds
-from ..constants import BAT_GROUPS
+from ..constants import BAT_GROUPS, ExportConstants
 from ..data import extract_events_with_datetime
 from ..data.processors import group_events_by_species
 from .base import BaseExportService
@@ -156,17 +156,29 @@ class TimeService(BaseExportService):
         """Calculate event counts for each species in each time bucket, grouped by status."""
         time_data = []
 
+        # Formatted start and end of each time bucket, shared by all species.
+        # Buckets are only formatted once they have events.
+        bucket_periods: Dict[int, Tuple[str, str]] = {}
+
         for species_tag, species_events in events_by_species.items():
-            for bucket_start, bucket_end in time_buckets:
-                # Find events in this time bucket
-                bucket_events = [event for event in species_events if bucket_start <= event["datetime"] < bucket_end]
+            # Dispatch each event to its time bucket in one pass
+            events_by_bucket = group_events_by_time_bucket(species_events, time_buckets)
+
+            for bucket_index, bucket_events in events_by_bucket.items():
+                period = bucket_periods.get(bucket_index)
+                if period is None:
+                    bucket_start, bucket_end = time_buckets[bucket_index]
+                    period = bucket_periods[bucket_index] = (
+                        bucket_start.strftime(ExportConstants.TIME_PERIOD_FORMAT),
+                        bucket_end.strftime(ExportConstants.TIME_PERIOD_FORMAT),
+                    )
+                period_start, period_end = period
 
                 # Group events by status
                 events_by_status = defaultdict(list)
                 for event in bucket_events:
-                    # Use the first status badge for grouping (events can have multiple status badges)
-                    primary_status = event["status_badges"][0] if event["status_badges"] else "no_status"
-                    events_by_status[primary_status].append(event)
+                    # Events can have multiple status badges, they are grouped by the first one
+                    events_by_status[event["primary_status"]].append(event)
 
                 # Create data entry for each status
                 for status, status_events in events_by_status.items():
@@ -174,8 +186,8 @@ class TimeService(BaseExportService):
 
                     time_data.append({
                         "project_name": project_name,
-                        "time_period_start": bucket_start.strftime("%Y-%m-%d %H:%M:%S"),
-                        "time_period_end": bucket_end.strftime("%Y-%m-%d %H:%M:%S"),
+                        "time_period_start": period_start,
+                        "time_period_end": period_end,
                         "species_tag": species_tag,
                         "status": status,
                         "event_count": event_count,
@@ -208,9 +220,8 @@ class TimeService(BaseExportService):
             # Group events by status
             events_by_status = defaultdict(list)
             for event in species_events:
-                # Use the first status badge for grouping (events can have multiple status badges)
-                primary_status = event["status_badges"][0] if event["status_badges"] else "no_status"
-                events_by_status[primary_status].append(event)
+                # Events can have multiple status badges, they are grouped by the first one
+                events_by_status[event["primary_status"]].append(event)
 
             # Create data entry for each status
             for status, status_events in events_by_status.items():
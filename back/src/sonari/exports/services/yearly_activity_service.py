@@ -1,8 +1,12 @@
 """Yearly activity analysis export service."""
 
+import asyncio
 import csv
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import StringIO
+from multiprocessing import get_context
 from typing import Any, Dict, List
 
 from ..charts.yearly_activity_chart import generate_yearly_activity_heatmap
@@ -12,6 +16,17 @@ from ..data.processors import group_events_by_species
 from .base import BaseExportService
 
 
+@lru_cache(maxsize=1)
+def _chart_process_pool() -> ProcessPoolExecutor:
+    """Return the pool of worker processes that render yearly activity charts.
+
+    The pool is created on first use and kept for the life of the process, so
+    the workers only import the chart module once. Like the application's other
+    process pools it uses spawn, since forking a multi-threaded server is unsafe.
+    """
+    return ProcessPoolExecutor(mp_context=get_context("spawn"))
+
+
 class YearlyActivityService(BaseExportService):
     """Service for yearly activity analysis exports."""
 
@@ -32,7 +47,7 @@ class YearlyActivityService(BaseExportService):
         parsed_start_date, parsed_end_date = self.parse_date_range(start_date, end_date)
 
         all_yearly_activity_data = []
-        chart_images = []
+        chart_arguments = []
         project_names = []
 
         # Process each project separately
@@ -66,18 +81,31 @@ class YearlyActivityService(BaseExportService):
             # Collect location data for sunrise/sunset calculations
             location_data = self._extract_location_data(events_with_datetime) if events_with_datetime else None
 
-            # Generate chart for this project (with subplots for each tag)
-            chart_base64 = generate_yearly_activity_heatmap(
+            # Collect the chart arguments of this project (with subplots for each tag)
+            chart_arguments.append((
                 project_yearly_activity_data,
                 project_name,
                 list(events_by_species.keys()) if events_with_datetime else [],
                 location_data,
-            )
-            chart_images.append(chart_base64)
+            ))
 
             # Add project yearly activity data to all data
             all_yearly_activity_data.extend(project_yearly_activity_data)
 
+        # Render the charts in parallel in worker processes, which keeps the event
+        # loop free. matplotlib is not safe to use from several threads at once,
+        # but each process draws its own standalone figures from plain data.
+        loop = asyncio.get_running_loop()
+        pool = _chart_process_pool()
+        chart_images = list(
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, generate_yearly_activity_heatmap, *arguments)
+                    for arguments in chart_arguments
+                )
+            )
+        )
+
         # Generate filename
         filename = self.generate_filename("yearly_activity")
 
@@ -2,12 +2,13 @@
 
 from .date_formatter import DateFormatter
 from .response_builder import create_csv_streaming_response
-from .tag_utils import extract_tag_set, extract_tag_values_from_selected, find_matching_tags
+from .tag_utils import extract_tag_set, extract_tag_values_from_selected, find_matching_tag_set, find_matching_tags
 
 __all__ = [
     "DateFormatter",
     "create_csv_streaming_response",
     "find_matching_tags",
+    "find_matching_tag_set",
     "extract_tag_set",
     "extract_tag_values_from_selected",
 ]
@@ -22,7 +22,7 @@ def extract_tag_values_from_selected(selected_tags: list[str]) -> list[str]:
     return tag_values
 
 
-def find_matching_tags(event_tags: set[str], selected_tags: list[str]) -> list[str]:
+def find_matching_tags(event_tags: frozenset[str], selected_tags: list[str]) -> list[str]:
     """Find which selected tags match the event tags.
 
     Args
@@ -38,6 +38,28 @@ def find_matching_tags(event_tags: set[str], selected_tags: list[str]) -> list[s
     return [tag_value for tag_value in selected_tag_values if tag_value in event_tags]
 
 
-def extract_tag_set(annotation_tags) -> set[str]:
+def find_matching_tag_set(event_tags: frozenset[str], selected_tag_values: frozenset[str]) -> frozenset[str]:
+    """Find which selected tag values match the event tags.
+
+    Unlike ``find_matching_tags``, the selected tags are given as their values,
+    extracted once for all events, and the result is unordered.
+
+    Parameters
+    ----------
+    event_tags : frozenset[str]
+        Set of tag values (just the value part).
+    selected_tag_values : frozenset[str]
+        Set of selected tag values (just the value part).
+
+    Returns
+    -------
+    frozenset[str]
+        Set of matching tag values (just the value part).
+
+    """
+    return event_tags & selected_tag_values
+
+
+def extract_tag_set(annotation_tags) -> frozenset[str]:
     """Extract tag set from annotation tags."""
-    return {tag.value for tag in annotation_tags}
+    return frozenset(tag.value for tag in annotation_tags)
@@ -0,0 +1,44 @@
+"""Add an expression index on the combined tag key.
+
+Bulk tag lookups compare ``key || '<US>' || value`` (joined with the ASCII
+unit separator) against a list of combined keys instead of using a
+``(key, value)`` row-value ``IN`` clause, which not every dialect can answer
+from the unique constraint's index. This adds the matching expression index.
+
+The migration is idempotent: databases created via ``metadata.create_all()``
+with the current model already have the index and are left untouched.
+
+Revision ID: d7c41e2a9b30
+Revises: f0e1d2c3b4a5
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7c41e2a9b30"
+down_revision: Union[str, None] = "f0e1d2c3b4a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if any(index["name"] == "ix_tag_key_value" for index in inspector.get_indexes("tag")):
+        return
+
+    op.create_index(
+        "ix_tag_key_value",
+        "tag",
+        # Keys and values are joined with the ASCII unit separator
+        [sa.text("(key || '\x1f' || value)")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tag_key_value", table_name="tag")
@@ -41,15 +41,23 @@ from typing import TYPE_CHECKING, Optional
 from uuid import UUID
 
 import sqlalchemy.orm as orm
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint, text
 
 from sonari.models.base import Base
 from sonari.models.user import User
 
 __all__ = [
+    "TAG_KEY_SEPARATOR",
     "Tag",
 ]
 
+TAG_KEY_SEPARATOR = "\x1f"
+"""Separator between key and value in the combined tag key.
+
+The ASCII unit separator is not expected in user-provided keys or values,
+so ``key || TAG_KEY_SEPARATOR || value`` identifies a tag uniquely.
+"""
+
 
 class Tag(Base):
     """Tag model for tag table.
@@ -77,7 +85,11 @@ class Tag(Base):
     """
 
     __tablename__ = "tag"
-    __table_args__ = (UniqueConstraint("key", "value"),)
+    __table_args__ = (
+        UniqueConstraint("key", "value"),
+        # Expression index for bulk lookups by the combined tag key.
+        Index("ix_tag_key_value", text(f"(key || '{TAG_KEY_SEPARATOR}' || value)")),
+    )
 
     id: orm.Mapped[int] = orm.mapped_column(primary_key=True, init=False)
     key: orm.Mapped[str] = orm.mapped_column(nullable=False)
@@ -1,6 +1,6 @@
 """Schemas for spectrograms."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 __all__ = [
     "AudioParameters",
@@ -10,6 +10,8 @@ __all__ = [
 class ResamplingParameters(BaseModel):
     """Parameters for resampling."""
 
+    model_config = ConfigDict(frozen=True)
+
     resample: bool = False
     """Whether to resample the audio."""
 
@@ -25,6 +27,8 @@ class FilteringParameters(BaseModel):
     applied, depending on which of the two is `None`.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     low_freq: float | None = None
     """Low frequency cutoff. Sounds of lower frequency will be attenuated."""
 
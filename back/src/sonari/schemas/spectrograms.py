@@ -2,7 +2,7 @@
 
 from typing import Literal
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 __all__ = [
     "SpectrogramParameters",
@@ -32,6 +32,8 @@ Window = Literal[
 class STFTParameters(BaseModel):
     """Parameters for STFT computation."""
 
+    model_config = ConfigDict(frozen=True)
+
     window_size_samples: int = 1024
     """Size of FFT window in samples."""
 
@@ -48,6 +50,8 @@ Scale = Literal["amplitude", "power", "dB"]
 class AmplitudeParameters(BaseModel):
     """Parameters for amplitude clamping."""
 
+    model_config = ConfigDict(frozen=True)
+
     scale: Scale = "dB"
     """Scale to use for spectrogram computation."""
 
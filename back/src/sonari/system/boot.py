@@ -1,8 +1,10 @@
+import logging
 import webbrowser
 
 from colorama import Fore, Style, just_fix_windows_console
 from fastapi import FastAPI
 
+from sonari.core.spectrograms import set_fft_backend
 from sonari.system.database import (
     get_database_url,
     init_database,
@@ -12,6 +14,8 @@ from sonari.system.settings import Settings
 
 just_fix_windows_console()
 
+logger = logging.getLogger(__name__)
+
 
 def print_ready_message(settings: Settings):
     host = settings.host
@@ -62,6 +66,9 @@ async def sonari_init(settings: Settings, _: FastAPI):
     if settings.dev:
         print_dev_message(settings)
 
+    if not set_fft_backend(settings.fft):
+        logger.warning("pyFFTW is not installed, falling back to scipy's FFT for spectrograms.")
+
     print("Please wait while the database is initialized...")
 
     await init_database(settings)
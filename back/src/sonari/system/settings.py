@@ -7,7 +7,7 @@ import os
 import warnings
 from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Type
+from typing import Literal, Tuple, Type
 
 from pydantic import ValidationError, computed_field
 from pydantic_settings import (
@@ -112,6 +112,14 @@ class Settings(BaseSettings):
     Should be set to INFO in production.
     """
 
+    fft: Literal["pocketfft", "fftw"] = "pocketfft"
+    """FFT implementation used for spectrograms.
+
+    ``pocketfft`` is the one bundled with scipy. ``fftw`` uses FFTW through
+    the optional ``pyFFTW`` package, which can be faster on some machines.
+    If pyFFTW is not installed, scipy's FFT is used instead.
+    """
+
     cors_origins: list[str] = [
         "http://localhost",
         "http://localhost:3000",
@@ -0,0 +1,16 @@
+"""Tests for the STFT in core/spectrograms.py."""
+
+import numpy as np
+import pytest
+
+from sonari.core.spectrograms import _stft
+
+
+def test_stft_rejects_overlap_of_window_shrunk_to_signal():
+    """Test the STFT raises when the window shrinks to the signal and the overlap no longer fits."""
+    # A 64 sample window at 75% overlap, shrunk to a 40 sample signal, would
+    # overlap by 48 samples
+    samples = np.random.default_rng(0).standard_normal(40)
+
+    with pytest.raises(ValueError, match="noverlap must be less than nperseg"):
+        _stft(samples, 1000, window_size_samples=64, hop_size_samples=16)
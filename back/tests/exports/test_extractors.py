@@ -4,31 +4,26 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sonari import models
-from sonari.exports.data.extractors import (
-    extract_annotation_data,
-    extract_batch,
-    load_status_badges_for_batch,
-)
+from sonari.exports.data.extractors import extract_annotation_rows, stream_annotations
 
 # ---------------------------------------------------------------------------
-# extract_batch
+# stream_annotations
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-async def test_extract_batch_returns_annotations(
+async def test_stream_annotations_returns_annotations(
     db_session: AsyncSession,
     test_annotation_project,
+    test_sound_event_annotation,
 ):
-    """Test extract_batch returns sound event annotations with relationships."""
-    batch = await extract_batch(
-        db_session,
-        [test_annotation_project.id],
-        offset=0,
-        batch_size=10,
-    )
-    assert isinstance(batch, list)
-    for ann in batch:
+    """Test stream_annotations yields sound event annotations with relationships."""
+    annotations = []
+    async for batch in stream_annotations(db_session, [test_annotation_project.id], batch_size=10):
+        annotations.extend(batch)
+
+    assert [ann.id for ann in annotations] == [test_sound_event_annotation.id]
+    for ann in annotations:
         assert isinstance(ann, models.SoundEventAnnotation)
         assert ann.annotation_task_id is not None
         assert hasattr(ann, "features")
@@ -37,87 +32,43 @@ async def test_extract_batch_returns_annotations(
 
 
 @pytest.mark.asyncio
-async def test_extract_batch_respects_offset_and_limit(
+async def test_stream_annotations_yields_batches_in_id_order(
     db_session: AsyncSession,
     test_annotation_project,
-):
-    """Test extract_batch respects offset and batch_size."""
-    batch = await extract_batch(
-        db_session,
-        [test_annotation_project.id],
-        offset=0,
-        batch_size=2,
-    )
-    assert len(batch) <= 2
-
-
-# ---------------------------------------------------------------------------
-# load_status_badges_for_batch
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_load_status_badges_for_batch_empty(db_session: AsyncSession):
-    """Test load_status_badges_for_batch with empty list does not raise."""
-    await load_status_badges_for_batch(db_session, [])
-
-
-@pytest.mark.asyncio
-async def test_load_status_badges_for_batch_with_annotations(
-    db_session: AsyncSession,
     test_sound_event_annotation,
 ):
-    """Test load_status_badges_for_batch loads badges for task IDs."""
-    from sqlalchemy import select
-    from sqlalchemy.orm import joinedload
+    """Test stream_annotations yields batches of at most batch_size annotations, in ID order."""
+    streamed = []
+    async for batch in stream_annotations(db_session, [test_annotation_project.id], batch_size=1):
+        assert len(batch) == 1
+        streamed.extend(batch)
 
-    stmt = (
-        select(models.SoundEventAnnotation)
-        .where(models.SoundEventAnnotation.id == test_sound_event_annotation.id)
-        .options(joinedload(models.SoundEventAnnotation.annotation_task))
-    )
-    result = await db_session.execute(stmt)
-    annotations = result.unique().scalars().all()
-    await load_status_badges_for_batch(db_session, annotations)
+    assert [ann.id for ann in streamed] == sorted(ann.id for ann in streamed)
+    assert test_sound_event_annotation.id in [ann.id for ann in streamed]
+    assert all(ann.annotation_task.status_badges is not None for ann in streamed)
 
 
 # ---------------------------------------------------------------------------
-# extract_annotation_data
+# extract_annotation_rows
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-async def test_extract_annotation_data_structure(
+async def test_extract_annotation_rows_structure(
     db_session: AsyncSession,
+    test_annotation_project,
     test_sound_event_annotation,
 ):
-    """Test extract_annotation_data returns dict with expected keys."""
-    from sqlalchemy import select
-    from sqlalchemy.orm import joinedload, selectinload
+    """Test extract_annotation_rows returns one dict with the expected keys per annotation."""
+    annotations = []
+    async for batch in stream_annotations(db_session, [test_annotation_project.id], batch_size=10):
+        annotations.extend(batch)
+    assert annotations
 
-    # Load annotation model with relationships
-    stmt = (
-        select(models.SoundEventAnnotation)
-        .where(models.SoundEventAnnotation.id == test_sound_event_annotation.id)
-        .options(
-            selectinload(models.SoundEventAnnotation.features),
-            selectinload(models.SoundEventAnnotation.tags),
-            joinedload(models.SoundEventAnnotation.recording)
-            .selectinload(models.Recording.recording_datasets)
-            .joinedload(models.DatasetRecording.dataset),
-            joinedload(models.SoundEventAnnotation.created_by),
-            joinedload(models.SoundEventAnnotation.annotation_task)
-            .selectinload(models.AnnotationTask.status_badges)
-            .joinedload(models.AnnotationStatusBadge.user),
-            joinedload(models.SoundEventAnnotation.annotation_task).selectinload(models.AnnotationTask.tags),
-        )
-    )
-    result = await db_session.execute(stmt)
-    ann = result.unique().scalar_one_or_none()
-    if ann is None:
-        pytest.skip("Sound event annotation not found")
+    rows = extract_annotation_rows(annotations)
+    assert len(rows) == len(annotations)
 
-    data = await extract_annotation_data(ann)
+    data = rows[0]
     assert isinstance(data, dict)
     assert "filename" in data
     assert "station" in data
@@ -131,6 +82,8 @@ async def test_extract_annotation_data_structure(
     assert "end_time" in data
     assert "geometry_type" in data
     assert "task_tags" in data
+    assert data["start_time"] == 0.5
+    assert data["higher_frequency"] == 500.0
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,50 @@
+"""Tests for exports/services/passes_service.py."""
+
+import datetime
+
+from sonari.exports.services.passes_service import PassesService
+
+# ---------------------------------------------------------------------------
+# _calculate_passes_per_species
+# ---------------------------------------------------------------------------
+
+
+def _event(hour: int, recording_filename: str, status: str = "completed") -> dict:
+    return {
+        "datetime": datetime.datetime(2024, 6, 1) + datetime.timedelta(hours=hour),
+        "recording_filename": recording_filename,
+        "status_badges": [status],
+        "primary_status": status,
+    }
+
+
+def test_calculate_passes_per_species_counts_recordings_over_threshold():
+    """Test passes are counted per bucket and status from the events of each recording."""
+    events_by_species = {
+        "bat": [
+            _event(0, "a.wav"),
+            _event(0, "a.wav"),
+            _event(1, "b.wav"),
+            _event(5, "c.wav"),
+            _event(5, "c.wav", status="assigned"),
+            _event(5, "c.wav", status="assigned"),
+            # Between the buckets and at the (exclusive) end of the last one
+            _event(3, "d.wav"),
+            _event(8, "e.wav"),
+        ]
+    }
+    time_buckets = [
+        (datetime.datetime(2024, 6, 1, 0), datetime.datetime(2024, 6, 1, 2)),
+        (datetime.datetime(2024, 6, 1, 4), datetime.datetime(2024, 6, 1, 8)),
+    ]
+
+    service = PassesService.__new__(PassesService)
+    passes_data = service._calculate_passes_per_species(events_by_species, time_buckets, 2, {}, "project")
+
+    assert [
+        (row["time_period_start"], row["status"], row["event_count"], row["pass_count"]) for row in passes_data
+    ] == [
+        ("2024-06-01 00:00:00", "completed", 3, 1),
+        ("2024-06-01 04:00:00", "completed", 1, 0),
+        ("2024-06-01 04:00:00", "assigned", 2, 1),
+    ]
@@ -0,0 +1,96 @@
+"""Tests for exports/data/processors.py."""
+
+import datetime
+
+import pytest
+from soundevent import data
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sonari import api, models, schemas
+from sonari.exports.data.processors import extract_bounding_box_coordinates, extract_events_with_datetime
+
+# ---------------------------------------------------------------------------
+# extract_bounding_box_coordinates
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "geometry, expected",
+    [
+        (data.BoundingBox(coordinates=[1, 2, 3, 4]), (1, 2, 3, 4)),
+        (data.TimeStamp(coordinates=1.5), (1.5, None, 1.5, None)),
+        (data.TimeInterval(coordinates=[1, 2]), (1, None, 2, None)),
+        (data.Point(coordinates=[1, 200]), (1, 200, 1, 200)),
+        (None, (None, None, None, None)),
+    ],
+)
+def test_extract_bounding_box_coordinates(geometry, expected):
+    """Test extract_bounding_box_coordinates maps each geometry type to its bounds."""
+    coords = extract_bounding_box_coordinates(geometry)
+    assert (
+        coords["start_time"],
+        coords["lower_frequency"],
+        coords["end_time"],
+        coords["higher_frequency"],
+    ) == expected
+
+
+# ---------------------------------------------------------------------------
+# extract_events_with_datetime
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_extract_events_with_datetime_filters_by_recording_date(
+    db_session: AsyncSession,
+    test_annotation_project,
+    test_annotation_task,
+    test_sound_event_annotation,
+    test_tag,
+    test_user,
+):
+    """Test extract_events_with_datetime only returns events of recordings in the date range."""
+    await api.sound_event_annotations.add_tag(
+        db_session,
+        test_sound_event_annotation,
+        test_tag,
+        schemas.SimpleUser.model_validate(test_user),
+    )
+    recording_date = datetime.date(2024, 6, 15)
+    await db_session.execute(
+        update(models.Recording)
+        .where(models.Recording.id == test_annotation_task.recording_id)
+        .values(date=recording_date, time=None)
+    )
+    await db_session.commit()
+
+    tags = [f"{test_tag.key}:{test_tag.value}"]
+    try:
+        with_datetime, without_datetime = await extract_events_with_datetime(
+            db_session,
+            [test_annotation_project.id],
+            tags,
+            None,
+            start_date=datetime.date(2024, 6, 1),
+            end_date=datetime.date(2024, 6, 30),
+        )
+        assert [event["datetime"] for event in with_datetime] == [datetime.datetime(2024, 6, 15)]
+        assert with_datetime[0]["tags"] == frozenset({test_tag.value})
+        assert with_datetime[0]["primary_status"] == "no_status"
+        assert without_datetime == []
+
+        with_datetime, without_datetime = await extract_events_with_datetime(
+            db_session,
+            [test_annotation_project.id],
+            tags,
+            None,
+            start_date=datetime.date(2024, 7, 1),
+        )
+        assert with_datetime == []
+        assert without_datetime == []
+    finally:
+        await db_session.execute(
+            update(models.Recording).where(models.Recording.id == test_annotation_task.recording_id).values(date=None)
+        )
+        await db_session.commit()
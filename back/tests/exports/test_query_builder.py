@@ -3,9 +3,11 @@
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from sonari import api, schemas
 from sonari.exports.data.query_builder import (
     build_status_filters,
     get_filtered_annotation_tasks,
+    get_task_tag_values,
     resolve_project_ids,
 )
 
@@ -109,3 +111,32 @@ async def test_get_filtered_annotation_tasks_with_status_filter(
     # May be 0 if no tasks have completed status
     assert isinstance(count, int)
     assert len(tasks) == count
+
+
+# ---------------------------------------------------------------------------
+# get_task_tag_values
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_get_task_tag_values_matches_requested_tags(
+    db_session: AsyncSession,
+    test_annotation_project,
+    test_annotation_task,
+    test_sound_event_annotation,
+    test_tag,
+    test_user,
+):
+    """Test get_task_tag_values returns the requested tag values of each task."""
+    await api.sound_event_annotations.add_tag(
+        db_session,
+        test_sound_event_annotation,
+        test_tag,
+        schemas.SimpleUser.model_validate(test_user),
+    )
+
+    tag_values_by_task = await get_task_tag_values(db_session, [test_annotation_project.id], {test_tag.value})
+    assert tag_values_by_task == {test_annotation_task.id: {test_tag.value}}
+
+    tag_values_by_task = await get_task_tag_values(db_session, [test_annotation_project.id], {"not-a-tag"})
+    assert tag_values_by_task == {}
@@ -1,9 +1,20 @@
 """Tests for export endpoints."""
 
+import csv
+import datetime
+from io import BytesIO, StringIO
+
 import pytest
 from httpx import AsyncClient
+from openpyxl import load_workbook
+from soundevent import data
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from sonari import schemas
+# sonari.routes is loaded before sonari.exports to resolve their circular import
+from sonari import api, models, routes, schemas  # noqa: F401
+from sonari.exports.constants import ExportConstants
+from sonari.exports.services.passes_service import PASSES_CSV_HEADERS
 
 
 @pytest.mark.asyncio
@@ -37,6 +48,11 @@ async def test_export_multibase_with_project(
     # Export should succeed even if project has no data
     assert response.status_code == 200
 
+    workbook = load_workbook(BytesIO(response.content), read_only=True)
+    assert workbook.sheetnames == ["Beobachtungen"]
+    rows = list(workbook["Beobachtungen"].iter_rows(values_only=True))
+    assert list(rows[0]) == ExportConstants.MULTIBASE_HEADERS
+
 
 @pytest.mark.asyncio
 async def test_export_dump_with_project(
@@ -54,6 +70,28 @@ async def test_export_dump_with_project(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_export_dump_writes_annotation_rows(
+    auth_client: AsyncClient,
+    test_annotation_project: schemas.AnnotationProject,
+    test_sound_event_annotation: schemas.SoundEventAnnotation,
+):
+    """Test dump export writes the header and one row per annotation."""
+    response = await auth_client.get(
+        "/api/v1/export/dump/",
+        params={
+            "annotation_project_ids": [test_annotation_project.id],
+        },
+    )
+    assert response.status_code == 200
+
+    rows = list(csv.reader(StringIO(response.text)))
+    assert rows[0] == list(ExportConstants.DUMP_HEADERS)
+    assert len(rows) == 2
+    assert len(rows[1]) == len(rows[0])
+    assert rows[1][-1] == "BoundingBox"
+
+
 @pytest.mark.asyncio
 async def test_export_passes_with_project(
     auth_client: AsyncClient,
@@ -74,6 +112,84 @@ async def test_export_passes_with_project(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_export_passes_csv_only(
+    auth_client: AsyncClient,
+    db_session: AsyncSession,
+    test_annotation_project: schemas.AnnotationProject,
+    test_annotation_task: schemas.AnnotationTask,
+    test_sound_event_annotation: schemas.SoundEventAnnotation,
+    test_recording: schemas.Recording,
+    test_tag: schemas.Tag,
+    test_user: models.User,
+):
+    """Test passes export streams the CSV rows when only the CSV is requested."""
+    created_by = schemas.SimpleUser.model_validate(test_user)
+
+    # A second annotation on a recording of the next day, so the events span a time bucket
+    other_task = await api.annotation_tasks.create(
+        db_session,
+        annotation_project=test_annotation_project,
+        recording=test_recording,
+        start_time=0.0,
+        end_time=1.0,
+    )
+    other_annotation = await api.sound_event_annotations.create(
+        db_session,
+        annotation_task=other_task,
+        geometry=data.BoundingBox(coordinates=[0.5, 100.0, 1.5, 500.0]),
+        created_by=created_by,
+    )
+    for annotation in (test_sound_event_annotation, other_annotation):
+        await api.sound_event_annotations.add_tag(db_session, annotation, test_tag, created_by)
+
+    recording_dates = {
+        test_annotation_task.recording_id: datetime.date(2024, 6, 15),
+        test_recording.id: datetime.date(2024, 6, 16),
+    }
+    for recording_id, recording_date in recording_dates.items():
+        await db_session.execute(
+            update(models.Recording).where(models.Recording.id == recording_id).values(date=recording_date, time=None)
+        )
+    await db_session.commit()
+
+    try:
+        response = await auth_client.get(
+            "/api/v1/export/passes/",
+            params={
+                "annotation_project_ids": [test_annotation_project.id],
+                "tags": [f"{test_tag.key}:{test_tag.value}"],
+                "event_count": 1,
+                "time_period_type": "predefined",
+                "predefined_period": "day",
+                "csv_only": True,
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+
+        # The bucket ends at the last event, which is not part of it
+        rows = list(csv.reader(StringIO(response.text)))
+        assert rows == [
+            list(PASSES_CSV_HEADERS),
+            [
+                test_annotation_project.name,
+                "2024-06-15 00:00:00",
+                "2024-06-16 00:00:00",
+                test_tag.value,
+                "no_status",
+                "1",
+                "1",
+                "1",
+            ],
+        ]
+    finally:
+        await db_session.execute(
+            update(models.Recording).where(models.Recording.id.in_(recording_dates)).values(date=None)
+        )
+        await db_session.commit()
+
+
 @pytest.mark.asyncio
 async def test_export_stats_with_project(
     auth_client: AsyncClient,